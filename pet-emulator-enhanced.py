@@ -1,11 +1,335 @@
 import curses
+import re
+import textwrap
 import time
 import threading
+from array import array
 from typing import Dict, List, Optional, Tuple, Union
 
+# Processor status (P register) bit masks
+FLAG_C = 0x01  # Carry
+FLAG_Z = 0x02  # Zero
+FLAG_I = 0x04  # Interrupt disable
+FLAG_D = 0x08  # Decimal mode
+FLAG_B = 0x10  # Break command (only exists in the pushed copy of P)
+FLAG_U = 0x20  # Unused, always reads as 1
+FLAG_V = 0x40  # Overflow
+FLAG_N = 0x80  # Negative
+
+# Base cycle count of every opcode, indexed by the opcode byte. Handlers
+# return only the extra cycles for page crossings and taken branches.
+# Undefined opcodes execute as 2-cycle NOPs.
+CYCLES = bytes((
+    # 0  1  2  3  4  5  6  7  8  9  A  B  C  D  E  F
+    7, 6, 2, 2, 2, 3, 5, 2, 3, 2, 2, 2, 2, 4, 6, 2,  # 0x
+    2, 5, 2, 2, 2, 4, 6, 2, 2, 4, 2, 2, 2, 4, 7, 2,  # 1x
+    6, 6, 2, 2, 3, 3, 5, 2, 4, 2, 2, 2, 4, 4, 6, 2,  # 2x
+    2, 5, 2, 2, 2, 4, 6, 2, 2, 4, 2, 2, 2, 4, 7, 2,  # 3x
+    6, 6, 2, 2, 2, 3, 5, 2, 3, 2, 2, 2, 3, 4, 6, 2,  # 4x
+    2, 5, 2, 2, 2, 4, 6, 2, 2, 4, 2, 2, 2, 4, 7, 2,  # 5x
+    6, 6, 2, 2, 2, 3, 5, 2, 4, 2, 2, 2, 5, 4, 6, 2,  # 6x
+    2, 5, 2, 2, 2, 4, 6, 2, 2, 4, 2, 2, 2, 4, 7, 2,  # 7x
+    2, 6, 2, 2, 3, 3, 3, 2, 2, 2, 2, 2, 4, 4, 4, 2,  # 8x
+    2, 6, 2, 2, 4, 4, 4, 2, 2, 5, 2, 2, 2, 5, 2, 2,  # 9x
+    2, 6, 2, 2, 3, 3, 3, 2, 2, 2, 2, 2, 4, 4, 4, 2,  # Ax
+    2, 5, 2, 2, 4, 4, 4, 2, 2, 4, 2, 2, 4, 4, 4, 2,  # Bx
+    2, 6, 2, 2, 3, 3, 5, 2, 2, 2, 2, 2, 4, 4, 6, 2,  # Cx
+    2, 5, 2, 2, 2, 4, 6, 2, 2, 4, 2, 2, 2, 4, 7, 2,  # Dx
+    2, 6, 2, 2, 3, 3, 5, 2, 2, 2, 2, 2, 4, 4, 6, 2,  # Ex
+    2, 5, 2, 2, 2, 4, 6, 2, 2, 4, 2, 2, 2, 4, 7, 2,  # Fx
+))
+
+
+def _build_bcd_tables() -> Tuple[array, array]:
+    """Tabulate decimal-mode ADC and SBC for every (A, operand, carry) input.
+    
+    Tables are indexed by (A << 9) | (operand << 1) | carry_in and hold
+    result | C << 8 | V << 9, with V as the NMOS 6502 computes it.
+    """
+    add = array('H', bytes(0x40000))
+    sub = array('H', bytes(0x40000))
+    
+    for a in range(256):
+        a_lo = a & 0x0F
+        a_hi = a >> 4
+        for value in range(256):
+            val_lo = value & 0x0F
+            val_hi = value >> 4
+            for carry_in in (0, 1):
+                index = (a << 9) | (value << 1) | carry_in
+                
+                # BCD addition; V comes from the sum before the high nibble
+                # is decimal-adjusted
+                result_lo = a_lo + val_lo + carry_in
+                carry_lo = 0
+                if result_lo > 9:
+                    result_lo = (result_lo + 6) & 0x0F
+                    carry_lo = 1
+                result_hi = a_hi + val_hi + carry_lo
+                overflow = (~(a ^ value) & (a ^ (result_hi << 4))) & 0x80
+                carry = 0
+                if result_hi > 9:
+                    result_hi = (result_hi + 6) & 0x0F
+                    carry = 1
+                add[index] = (result_hi << 4) | result_lo | carry << 8 | overflow << 2
+                
+                # BCD subtraction with borrow; V is the same as in binary mode
+                binary = a - value - (1 - carry_in)
+                overflow = ((a ^ value) & (a ^ binary)) & 0x80
+                result_lo = a_lo - val_lo - (1 - carry_in)
+                borrow_lo = 0
+                if result_lo < 0:
+                    result_lo += 10
+                    borrow_lo = 1
+                result_hi = a_hi - val_hi - borrow_lo
+                carry = 1
+                if result_hi < 0:
+                    result_hi += 10
+                    carry = 0
+                sub[index] = ((result_hi << 4) | result_lo) & 0xFF | carry << 8 | overflow << 2
+    
+    return add, sub
+
+
+BCD_ADD, BCD_SUB = _build_bcd_tables()
+
+# Z and N bits of P for each value of CPU6502._zn: Z when the low byte is 0,
+# N when bit 7 (or bit 8, used by BIT) is set
+ZN_FLAGS = bytes((0 if zn & 0xFF else FLAG_Z) | (FLAG_N if zn & 0x180 else 0)
+                 for zn in range(0x200))
+
+
+def _status_flag(mask: int, doc: str) -> property:
+    """Expose a single bit of the P register as a 0/1 attribute."""
+    def getter(self) -> int:
+        return 1 if self.P & mask else 0
+    
+    def setter(self, value: int) -> None:
+        if value:
+            self.P |= mask
+        else:
+            self.P &= ~mask
+    
+    return property(getter, setter, doc=doc)
+
+
+# Operand fetch for each addressing mode, inlined into generated handlers.
+# Each snippet advances the PC past the operand and leaves the effective
+# address in ``addr`` (the operand itself in ``value`` for immediate mode).
+# Indexed modes also leave the unindexed address in ``base``. Operand bytes
+# come straight from ``ram``, since code is never fetched from I/O space.
+_MODE_SOURCE = {
+    'immediate': (
+        "value = ram[pc]\n"
+        "self.PC = (pc + 1) & 0xFFFF\n"),
+    'zeropage': (
+        "addr = ram[pc]\n"
+        "self.PC = (pc + 1) & 0xFFFF\n"),
+    'zeropageX': (
+        "addr = (ram[pc] + self.X) & 0xFF\n"
+        "self.PC = (pc + 1) & 0xFFFF\n"),
+    'zeropageY': (
+        "addr = (ram[pc] + self.Y) & 0xFF\n"
+        "self.PC = (pc + 1) & 0xFFFF\n"),
+    'absolute': (
+        "addr = ram[pc] | (ram[(pc + 1) & 0xFFFF] << 8)\n"
+        "self.PC = (pc + 2) & 0xFFFF\n"),
+    'absoluteX': (
+        "base = ram[pc] | (ram[(pc + 1) & 0xFFFF] << 8)\n"
+        "self.PC = (pc + 2) & 0xFFFF\n"
+        "addr = (base + self.X) & 0xFFFF\n"),
+    'absoluteY': (
+        "base = ram[pc] | (ram[(pc + 1) & 0xFFFF] << 8)\n"
+        "self.PC = (pc + 2) & 0xFFFF\n"
+        "addr = (base + self.Y) & 0xFFFF\n"),
+    'indirectX': (
+        "ptr = (ram[pc] + self.X) & 0xFF\n"
+        "self.PC = (pc + 1) & 0xFFFF\n"
+        "addr = read(ptr) | (read((ptr + 1) & 0xFF) << 8)\n"),
+    'indirectY': (
+        "ptr = ram[pc]\n"
+        "self.PC = (pc + 1) & 0xFFFF\n"
+        "base = read(ptr) | (read((ptr + 1) & 0xFF) << 8)\n"
+        "addr = (base + self.Y) & 0xFFFF\n"),
+}
+
+# Operand handling for the ``_decoded`` handler variants that predecode()
+# maps for code in ROM. These get the operand bytes already fetched in
+# ``operand`` and are entered with PC just past the opcode; since predecode()
+# only maps instructions that end below $FFFF, PC needs no wrapping.
+_DECODED_MODE_SOURCE = {
+    'immediate': (
+        "value = operand\n"
+        "self.PC += 1\n"),
+    'zeropage': (
+        "addr = operand\n"
+        "self.PC += 1\n"),
+    'zeropageX': (
+        "addr = (operand + self.X) & 0xFF\n"
+        "self.PC += 1\n"),
+    'zeropageY': (
+        "addr = (operand + self.Y) & 0xFF\n"
+        "self.PC += 1\n"),
+    'absolute': (
+        "addr = operand\n"
+        "self.PC += 2\n"),
+    'absoluteX': (
+        "base = operand\n"
+        "self.PC += 2\n"
+        "addr = (base + self.X) & 0xFFFF\n"),
+    'absoluteY': (
+        "base = operand\n"
+        "self.PC += 2\n"
+        "addr = (base + self.Y) & 0xFFFF\n"),
+    'indirectX': (
+        "ptr = (operand + self.X) & 0xFF\n"
+        "self.PC += 1\n"
+        "addr = read(ptr) | (read((ptr + 1) & 0xFF) << 8)\n"),
+    'indirectY': (
+        "ptr = operand\n"
+        "self.PC += 1\n"
+        "base = read(ptr) | (read((ptr + 1) & 0xFF) << 8)\n"
+        "addr = (base + self.Y) & 0xFFFF\n"),
+}
+
+# Number of operand bytes following the opcode in each addressing mode
+_OPERAND_BYTES = {
+    'immediate': 1, 'zeropage': 1, 'zeropageX': 1, 'zeropageY': 1,
+    'absolute': 2, 'absoluteX': 2, 'absoluteY': 2,
+    'indirectX': 1, 'indirectY': 1,
+}
+
+# Indexed modes that take an extra cycle when a read crosses a page
+_PAGE_CROSSING_MODES = ('absoluteX', 'absoluteY', 'indirectY')
+
+# Operation bodies; read operations find their operand in ``value``, and
+# read-modify-write operations leave the byte to store back in ``value``
+_OP_SOURCE = {
+    'LDA': "self.A = self._zn = value\n",
+    'LDX': "self.X = self._zn = value\n",
+    'LDY': "self.Y = self._zn = value\n",
+    'STA': "write(addr, self.A)\n",
+    'STX': "write(addr, self.X)\n",
+    'STY': "write(addr, self.Y)\n",
+    'AND': "self.A = self._zn = self.A & value\n",
+    'ORA': "self.A = self._zn = self.A | value\n",
+    'EOR': "self.A = self._zn = self.A ^ value\n",
+    'BIT': (
+        "self._zn = (self.A & value) | (value & 0x80) << 1\n"
+        "self._v = value << 1\n"),
+    'ADC': (
+        "if self.P & FLAG_D:\n"
+        "    self._add_with_carry(value)\n"
+        "else:\n"
+        "    a = self.A\n"
+        "    self._c = temp = a + value + (self._c >> 8)\n"
+        "    self._v = ~(a ^ value) & (a ^ temp)\n"
+        "    self.A = self._zn = temp & 0xFF\n"),
+    'SBC': (
+        "if self.P & FLAG_D:\n"
+        "    self._subtract_with_carry(value)\n"
+        "else:\n"
+        "    a = self.A\n"
+        "    value ^= 0xFF\n"
+        "    self._c = temp = a + value + (self._c >> 8)\n"
+        "    self._v = ~(a ^ value) & (a ^ temp)\n"
+        "    self.A = self._zn = temp & 0xFF\n"),
+    'CMP': (
+        "self._c = temp = self.A + 0x100 - value\n"
+        "self._zn = temp & 0xFF\n"),
+    'CPX': (
+        "self._c = temp = self.X + 0x100 - value\n"
+        "self._zn = temp & 0xFF\n"),
+    'CPY': (
+        "self._c = temp = self.Y + 0x100 - value\n"
+        "self._zn = temp & 0xFF\n"),
+    'INC': (
+        "value = (value + 1) & 0xFF\n"
+        "self._zn = value\n"),
+    'DEC': (
+        "value = (value - 1) & 0xFF\n"
+        "self._zn = value\n"),
+    'ASL': (
+        "self._c = value = value << 1\n"
+        "self._zn = value = value & 0xFF\n"),
+    'LSR': (
+        "self._c = (value & 1) << 8\n"
+        "self._zn = value = value >> 1\n"),
+    'ROL': (
+        "self._c = value = (value << 1) | (self._c >> 8)\n"
+        "self._zn = value = value & 0xFF\n"),
+    'ROR': (
+        "value |= self._c & 0x100\n"
+        "self._c = (value & 1) << 8\n"
+        "self._zn = value = value >> 1\n"),
+}
+
+_STORE_OPS = ('STA', 'STX', 'STY')
+
+# Read-modify-write operations; these never take the page-crossing penalty
+_RMW_OPS = ('INC', 'DEC', 'ASL', 'LSR', 'ROL', 'ROR')
+
+# Memory addressing modes shared by the read-modify-write ops
+_RMW_MODES = ('zeropage', 'zeropageX', 'absolute', 'absoluteX')
+
+# Addressing modes shared by the accumulator ALU ops
+_ALU_MODES = ('immediate', 'zeropage', 'zeropageX', 'absolute',
+              'absoluteX', 'absoluteY', 'indirectX', 'indirectY')
+
+# Handlers built by CPU6502._codegen_handlers(): operation -> addressing modes
+_GENERATED_HANDLERS = {
+    # Load/Store Operations
+    'LDA': _ALU_MODES,
+    'LDX': ('immediate', 'zeropage', 'zeropageY', 'absolute', 'absoluteY'),
+    'LDY': ('immediate', 'zeropage', 'zeropageX', 'absolute', 'absoluteX'),
+    'STA': ('zeropage', 'zeropageX', 'absolute', 'absoluteX', 'absoluteY',
+            'indirectX', 'indirectY'),
+    'STX': ('zeropage', 'zeropageY', 'absolute'),
+    'STY': ('zeropage', 'zeropageX', 'absolute'),
+    
+    # Logical Operations
+    'AND': _ALU_MODES,
+    'ORA': _ALU_MODES,
+    'EOR': _ALU_MODES,
+    'BIT': ('zeropage', 'absolute'),
+    
+    # Arithmetic Operations
+    'ADC': _ALU_MODES,
+    'SBC': _ALU_MODES,
+    'CMP': _ALU_MODES,
+    'CPX': ('immediate', 'zeropage', 'absolute'),
+    'CPY': ('immediate', 'zeropage', 'absolute'),
+    
+    # Increments & Decrements
+    'INC': _RMW_MODES,
+    'DEC': _RMW_MODES,
+    
+    # Shifts & Rotates
+    'ASL': _RMW_MODES,
+    'LSR': _RMW_MODES,
+    'ROL': _RMW_MODES,
+    'ROR': _RMW_MODES,
+}
+
+# Branch opcodes and the condition under which each is taken
+_BRANCH_CONDITIONS = {
+    0x90: ('BCC', "self._c < 0x100"),
+    0xB0: ('BCS', "self._c > 0xFF"),
+    0xF0: ('BEQ', "not self._zn & 0xFF"),
+    0x30: ('BMI', "self._zn & 0x180"),
+    0xD0: ('BNE', "self._zn & 0xFF"),
+    0x10: ('BPL', "not self._zn & 0x180"),
+    0x50: ('BVC', "not self._v & 0x80"),
+    0x70: ('BVS', "self._v & 0x80"),
+}
+
+
 class CPU6502:
     """Emulates a MOS 6502 processor with full instruction set and addressing modes."""
     
+    __slots__ = ('A', 'X', 'Y', 'PC', 'SP', 'P', '_zn', '_c', '_v', 'total_cycles',
+                 'irq_pending', 'nmi_pending', 'fast_dispatch')
+    
     def __init__(self):
         # Main registers
         self.A = 0       # Accumulator
@@ -14,1484 +338,871 @@ class CPU6502:
         self.PC = 0      # Program counter
         self.SP = 0xFF   # Stack pointer (starts at 0xFF, decrements when pushing)
         
-        # Status register flags (P register)
-        self.C = 0  # Carry
-        self.Z = 0  # Zero
-        self.I = 0  # Interrupt disable
-        self.D = 0  # Decimal mode
-        self.B = 0  # Break command
-        self.V = 0  # Overflow
-        self.N = 0  # Negative
+        # Status register (P register), packed as on the real chip. Only I
+        # and D live in P itself; get_status() merges in the lazy flags.
+        self.P = FLAG_U
+        
+        # Z and N are evaluated lazily from the last result that affected
+        # them: Z is set when the low byte of _zn is zero, N when bit 7 or
+        # bit 8 is set (bit 8 lets BIT report N independently of Z).
+        self._zn = 1
+        
+        # C and V are likewise kept as raw results: C is bit 8 of _c (which
+        # never exceeds 0x1FF), V is bit 7 of _v.
+        self._c = 0
+        self._v = 0
         
         # Cycle counting and timing
-        self.cycles = 0
         self.total_cycles = 0
         
         # Interrupt handling
         self.irq_pending = False
         self.nmi_pending = False
         
-        # Initialize instruction table
-        self._init_instruction_table()
-    
-    def _init_instruction_table(self):
-        """Initialize the full 6502 instruction set."""
-        self.instructions = {
+        # Predecoded ROM instructions by address, filled in by predecode()
+        self.fast_dispatch = [None] * 0x10000
+    
+    @classmethod
+    def _init_instruction_table(cls) -> None:
+        """Initialize the full 6502 instruction set.
+        
+        Dispatch goes through the class-level HANDLERS list, indexed directly
+        by the opcode byte and holding plain functions that are called as
+        ``HANDLERS[opcode](cpu, memory)``; undefined opcodes map to
+        ``_illegal``. The table is built once from CPU6502's own handlers,
+        and predecode() uses those too, so overriding a handler in a
+        subclass does not change dispatch.
+        """
+        opcodes = {
             # Load/Store Operations
-            0xA9: self.LDA_immediate,  # LDA Immediate
-            0xA5: self.LDA_zeropage,   # LDA Zero Page
-            0xB5: self.LDA_zeropageX,  # LDA Zero Page,X
-            0xAD: self.LDA_absolute,   # LDA Absolute
-            0xBD: self.LDA_absoluteX,  # LDA Absolute,X
-            0xB9: self.LDA_absoluteY,  # LDA Absolute,Y
-            0xA1: self.LDA_indirectX,  # LDA (Indirect,X)
-            0xB1: self.LDA_indirectY,  # LDA (Indirect),Y
+            0xA9: cls.LDA_immediate,  # LDA Immediate
+            0xA5: cls.LDA_zeropage,   # LDA Zero Page
+            0xB5: cls.LDA_zeropageX,  # LDA Zero Page,X
+            0xAD: cls.LDA_absolute,   # LDA Absolute
+            0xBD: cls.LDA_absoluteX,  # LDA Absolute,X
+            0xB9: cls.LDA_absoluteY,  # LDA Absolute,Y
+            0xA1: cls.LDA_indirectX,  # LDA (Indirect,X)
+            0xB1: cls.LDA_indirectY,  # LDA (Indirect),Y
             
-            0xA2: self.LDX_immediate,  # LDX Immediate
-            0xA6: self.LDX_zeropage,   # LDX Zero Page
-            0xB6: self.LDX_zeropageY,  # LDX Zero Page,Y
-            0xAE: self.LDX_absolute,   # LDX Absolute
-            0xBE: self.LDX_absoluteY,  # LDX Absolute,Y
+            0xA2: cls.LDX_immediate,  # LDX Immediate
+            0xA6: cls.LDX_zeropage,   # LDX Zero Page
+            0xB6: cls.LDX_zeropageY,  # LDX Zero Page,Y
+            0xAE: cls.LDX_absolute,   # LDX Absolute
+            0xBE: cls.LDX_absoluteY,  # LDX Absolute,Y
             
-            0xA0: self.LDY_immediate,  # LDY Immediate
-            0xA4: self.LDY_zeropage,   # LDY Zero Page
-            0xB4: self.LDY_zeropageX,  # LDY Zero Page,X
-            0xAC: self.LDY_absolute,   # LDY Absolute
-            0xBC: self.LDY_absoluteX,  # LDY Absolute,X
+            0xA0: cls.LDY_immediate,  # LDY Immediate
+            0xA4: cls.LDY_zeropage,   # LDY Zero Page
+            0xB4: cls.LDY_zeropageX,  # LDY Zero Page,X
+            0xAC: cls.LDY_absolute,   # LDY Absolute
+            0xBC: cls.LDY_absoluteX,  # LDY Absolute,X
             
-            0x85: self.STA_zeropage,   # STA Zero Page
-            0x95: self.STA_zeropageX,  # STA Zero Page,X
-            0x8D: self.STA_absolute,   # STA Absolute
-            0x9D: self.STA_absoluteX,  # STA Absolute,X
-            0x99: self.STA_absoluteY,  # STA Absolute,Y
-            0x81: self.STA_indirectX,  # STA (Indirect,X)
-            0x91: self.STA_indirectY,  # STA (Indirect),Y
+            0x85: cls.STA_zeropage,   # STA Zero Page
+            0x95: cls.STA_zeropageX,  # STA Zero Page,X
+            0x8D: cls.STA_absolute,   # STA Absolute
+            0x9D: cls.STA_absoluteX,  # STA Absolute,X
+            0x99: cls.STA_absoluteY,  # STA Absolute,Y
+            0x81: cls.STA_indirectX,  # STA (Indirect,X)
+            0x91: cls.STA_indirectY,  # STA (Indirect),Y
             
-            0x86: self.STX_zeropage,   # STX Zero Page
-            0x96: self.STX_zeropageY,  # STX Zero Page,Y
-            0x8E: self.STX_absolute,   # STX Absolute
+            0x86: cls.STX_zeropage,   # STX Zero Page
+            0x96: cls.STX_zeropageY,  # STX Zero Page,Y
+            0x8E: cls.STX_absolute,   # STX Absolute
             
-            0x84: self.STY_zeropage,   # STY Zero Page
-            0x94: self.STY_zeropageX,  # STY Zero Page,X
-            0x8C: self.STY_absolute,   # STY Absolute
+            0x84: cls.STY_zeropage,   # STY Zero Page
+            0x94: cls.STY_zeropageX,  # STY Zero Page,X
+            0x8C: cls.STY_absolute,   # STY Absolute
             
             # Register Transfers
-            0xAA: self.TAX,  # TAX
-            0x8A: self.TXA,  # TXA
-            0xA8: self.TAY,  # TAY
-            0x98: self.TYA,  # TYA
-            0xBA: self.TSX,  # TSX
-            0x9A: self.TXS,  # TXS
+            0xAA: cls.TAX,  # TAX
+            0x8A: cls.TXA,  # TXA
+            0xA8: cls.TAY,  # TAY
+            0x98: cls.TYA,  # TYA
+            0xBA: cls.TSX,  # TSX
+            0x9A: cls.TXS,  # TXS
             
             # Stack Operations
-            0x48: self.PHA,  # PHA
-            0x68: self.PLA,  # PLA
-            0x08: self.PHP,  # PHP
-            0x28: self.PLP,  # PLP
+            0x48: cls.PHA,  # PHA
+            0x68: cls.PLA,  # PLA
+            0x08: cls.PHP,  # PHP
+            0x28: cls.PLP,  # PLP
             
             # Logical Operations
-            0x29: self.AND_immediate,  # AND Immediate
-            0x25: self.AND_zeropage,   # AND Zero Page
-            0x35: self.AND_zeropageX,  # AND Zero Page,X
-            0x2D: self.AND_absolute,   # AND Absolute
-            0x3D: self.AND_absoluteX,  # AND Absolute,X
-            0x39: self.AND_absoluteY,  # AND Absolute,Y
-            0x21: self.AND_indirectX,  # AND (Indirect,X)
-            0x31: self.AND_indirectY,  # AND (Indirect),Y
+            0x29: cls.AND_immediate,  # AND Immediate
+            0x25: cls.AND_zeropage,   # AND Zero Page
+            0x35: cls.AND_zeropageX,  # AND Zero Page,X
+            0x2D: cls.AND_absolute,   # AND Absolute
+            0x3D: cls.AND_absoluteX,  # AND Absolute,X
+            0x39: cls.AND_absoluteY,  # AND Absolute,Y
+            0x21: cls.AND_indirectX,  # AND (Indirect,X)
+            0x31: cls.AND_indirectY,  # AND (Indirect),Y
             
-            0x09: self.ORA_immediate,  # ORA Immediate
-            0x05: self.ORA_zeropage,   # ORA Zero Page
-            0x15: self.ORA_zeropageX,  # ORA Zero Page,X
-            0x0D: self.ORA_absolute,   # ORA Absolute
-            0x1D: self.ORA_absoluteX,  # ORA Absolute,X
-            0x19: self.ORA_absoluteY,  # ORA Absolute,Y
-            0x01: self.ORA_indirectX,  # ORA (Indirect,X)
-            0x11: self.ORA_indirectY,  # ORA (Indirect),Y
+            0x09: cls.ORA_immediate,  # ORA Immediate
+            0x05: cls.ORA_zeropage,   # ORA Zero Page
+            0x15: cls.ORA_zeropageX,  # ORA Zero Page,X
+            0x0D: cls.ORA_absolute,   # ORA Absolute
+            0x1D: cls.ORA_absoluteX,  # ORA Absolute,X
+            0x19: cls.ORA_absoluteY,  # ORA Absolute,Y
+            0x01: cls.ORA_indirectX,  # ORA (Indirect,X)
+            0x11: cls.ORA_indirectY,  # ORA (Indirect),Y
             
-            0x49: self.EOR_immediate,  # EOR Immediate
-            0x45: self.EOR_zeropage,   # EOR Zero Page
-            0x55: self.EOR_zeropageX,  # EOR Zero Page,X
-            0x4D: self.EOR_absolute,   # EOR Absolute
-            0x5D: self.EOR_absoluteX,  # EOR Absolute,X
-            0x59: self.EOR_absoluteY,  # EOR Absolute,Y
-            0x41: self.EOR_indirectX,  # EOR (Indirect,X)
-            0x51: self.EOR_indirectY,  # EOR (Indirect),Y
+            0x49: cls.EOR_immediate,  # EOR Immediate
+            0x45: cls.EOR_zeropage,   # EOR Zero Page
+            0x55: cls.EOR_zeropageX,  # EOR Zero Page,X
+            0x4D: cls.EOR_absolute,   # EOR Absolute
+            0x5D: cls.EOR_absoluteX,  # EOR Absolute,X
+            0x59: cls.EOR_absoluteY,  # EOR Absolute,Y
+            0x41: cls.EOR_indirectX,  # EOR (Indirect,X)
+            0x51: cls.EOR_indirectY,  # EOR (Indirect),Y
             
-            0x24: self.BIT_zeropage,   # BIT Zero Page
-            0x2C: self.BIT_absolute,   # BIT Absolute
+            0x24: cls.BIT_zeropage,   # BIT Zero Page
+            0x2C: cls.BIT_absolute,   # BIT Absolute
             
             # Arithmetic Operations
-            0x69: self.ADC_immediate,  # ADC Immediate
-            0x65: self.ADC_zeropage,   # ADC Zero Page
-            0x75: self.ADC_zeropageX,  # ADC Zero Page,X
-            0x6D: self.ADC_absolute,   # ADC Absolute
-            0x7D: self.ADC_absoluteX,  # ADC Absolute,X
-            0x79: self.ADC_absoluteY,  # ADC Absolute,Y
-            0x61: self.ADC_indirectX,  # ADC (Indirect,X)
-            0x71: self.ADC_indirectY,  # ADC (Indirect),Y
+            0x69: cls.ADC_immediate,  # ADC Immediate
+            0x65: cls.ADC_zeropage,   # ADC Zero Page
+            0x75: cls.ADC_zeropageX,  # ADC Zero Page,X
+            0x6D: cls.ADC_absolute,   # ADC Absolute
+            0x7D: cls.ADC_absoluteX,  # ADC Absolute,X
+            0x79: cls.ADC_absoluteY,  # ADC Absolute,Y
+            0x61: cls.ADC_indirectX,  # ADC (Indirect,X)
+            0x71: cls.ADC_indirectY,  # ADC (Indirect),Y
             
-            0xE9: self.SBC_immediate,  # SBC Immediate
-            0xE5: self.SBC_zeropage,   # SBC Zero Page
-            0xF5: self.SBC_zeropageX,  # SBC Zero Page,X
-            0xED: self.SBC_absolute,   # SBC Absolute
-            0xFD: self.SBC_absoluteX,  # SBC Absolute,X
-            0xF9: self.SBC_absoluteY,  # SBC Absolute,Y
-            0xE1: self.SBC_indirectX,  # SBC (Indirect,X)
-            0xF1: self.SBC_indirectY,  # SBC (Indirect),Y
+            0xE9: cls.SBC_immediate,  # SBC Immediate
+            0xE5: cls.SBC_zeropage,   # SBC Zero Page
+            0xF5: cls.SBC_zeropageX,  # SBC Zero Page,X
+            0xED: cls.SBC_absolute,   # SBC Absolute
+            0xFD: cls.SBC_absoluteX,  # SBC Absolute,X
+            0xF9: cls.SBC_absoluteY,  # SBC Absolute,Y
+            0xE1: cls.SBC_indirectX,  # SBC (Indirect,X)
+            0xF1: cls.SBC_indirectY,  # SBC (Indirect),Y
             
-            0xC9: self.CMP_immediate,  # CMP Immediate
-            0xC5: self.CMP_zeropage,   # CMP Zero Page
-            0xD5: self.CMP_zeropageX,  # CMP Zero Page,X
-            0xCD: self.CMP_absolute,   # CMP Absolute
-            0xDD: self.CMP_absoluteX,  # CMP Absolute,X
-            0xD9: self.CMP_absoluteY,  # CMP Absolute,Y
-            0xC1: self.CMP_indirectX,  # CMP (Indirect,X)
-            0xD1: self.CMP_indirectY,  # CMP (Indirect),Y
+            0xC9: cls.CMP_immediate,  # CMP Immediate
+            0xC5: cls.CMP_zeropage,   # CMP Zero Page
+            0xD5: cls.CMP_zeropageX,  # CMP Zero Page,X
+            0xCD: cls.CMP_absolute,   # CMP Absolute
+            0xDD: cls.CMP_absoluteX,  # CMP Absolute,X
+            0xD9: cls.CMP_absoluteY,  # CMP Absolute,Y
+            0xC1: cls.CMP_indirectX,  # CMP (Indirect,X)
+            0xD1: cls.CMP_indirectY,  # CMP (Indirect),Y
             
-            0xE0: self.CPX_immediate,  # CPX Immediate
-            0xE4: self.CPX_zeropage,   # CPX Zero Page
-            0xEC: self.CPX_absolute,   # CPX Absolute
+            0xE0: cls.CPX_immediate,  # CPX Immediate
+            0xE4: cls.CPX_zeropage,   # CPX Zero Page
+            0xEC: cls.CPX_absolute,   # CPX Absolute
             
-            0xC0: self.CPY_immediate,  # CPY Immediate
-            0xC4: self.CPY_zeropage,   # CPY Zero Page
-            0xCC: self.CPY_absolute,   # CPY Absolute
+            0xC0: cls.CPY_immediate,  # CPY Immediate
+            0xC4: cls.CPY_zeropage,   # CPY Zero Page
+            0xCC: cls.CPY_absolute,   # CPY Absolute
             
             # Increments & Decrements
-            0xE6: self.INC_zeropage,   # INC Zero Page
-            0xF6: self.INC_zeropageX,  # INC Zero Page,X
-            0xEE: self.INC_absolute,   # INC Absolute
-            0xFE: self.INC_absoluteX,  # INC Absolute,X
+            0xE6: cls.INC_zeropage,   # INC Zero Page
+            0xF6: cls.INC_zeropageX,  # INC Zero Page,X
+            0xEE: cls.INC_absolute,   # INC Absolute
+            0xFE: cls.INC_absoluteX,  # INC Absolute,X
             
-            0xE8: self.INX,  # INX
-            0xC8: self.INY,  # INY
+            0xE8: cls.INX,  # INX
+            0xC8: cls.INY,  # INY
             
-            0xC6: self.DEC_zeropage,   # DEC Zero Page
-            0xD6: self.DEC_zeropageX,  # DEC Zero Page,X
-            0xCE: self.DEC_absolute,   # DEC Absolute
-            0xDE: self.DEC_absoluteX,  # DEC Absolute,X
+            0xC6: cls.DEC_zeropage,   # DEC Zero Page
+            0xD6: cls.DEC_zeropageX,  # DEC Zero Page,X
+            0xCE: cls.DEC_absolute,   # DEC Absolute
+            0xDE: cls.DEC_absoluteX,  # DEC Absolute,X
             
-            0xCA: self.DEX,  # DEX
-            0x88: self.DEY,  # DEY
+            0xCA: cls.DEX,  # DEX
+            0x88: cls.DEY,  # DEY
             
             # Shifts
-            0x0A: self.ASL_accumulator,  # ASL Accumulator
-            0x06: self.ASL_zeropage,     # ASL Zero Page
-            0x16: self.ASL_zeropageX,    # ASL Zero Page,X
-            0x0E: self.ASL_absolute,     # ASL Absolute
-            0x1E: self.ASL_absoluteX,    # ASL Absolute,X
+            0x0A: cls.ASL_accumulator,  # ASL Accumulator
+            0x06: cls.ASL_zeropage,     # ASL Zero Page
+            0x16: cls.ASL_zeropageX,    # ASL Zero Page,X
+            0x0E: cls.ASL_absolute,     # ASL Absolute
+            0x1E: cls.ASL_absoluteX,    # ASL Absolute,X
             
-            0x4A: self.LSR_accumulator,  # LSR Accumulator
-            0x46: self.LSR_zeropage,     # LSR Zero Page
-            0x56: self.LSR_zeropageX,    # LSR Zero Page,X
-            0x4E: self.LSR_absolute,     # LSR Absolute
-            0x5E: self.LSR_absoluteX,    # LSR Absolute,X
+            0x4A: cls.LSR_accumulator,  # LSR Accumulator
+            0x46: cls.LSR_zeropage,     # LSR Zero Page
+            0x56: cls.LSR_zeropageX,    # LSR Zero Page,X
+            0x4E: cls.LSR_absolute,     # LSR Absolute
+            0x5E: cls.LSR_absoluteX,    # LSR Absolute,X
             
-            0x2A: self.ROL_accumulator,  # ROL Accumulator
-            0x26: self.ROL_zeropage,     # ROL Zero Page
-            0x36: self.ROL_zeropageX,    # ROL Zero Page,X
-            0x2E: self.ROL_absolute,     # ROL Absolute
-            0x3E: self.ROL_absoluteX,    # ROL Absolute,X
+            0x2A: cls.ROL_accumulator,  # ROL Accumulator
+            0x26: cls.ROL_zeropage,     # ROL Zero Page
+            0x36: cls.ROL_zeropageX,    # ROL Zero Page,X
+            0x2E: cls.ROL_absolute,     # ROL Absolute
+            0x3E: cls.ROL_absoluteX,    # ROL Absolute,X
             
-            0x6A: self.ROR_accumulator,  # ROR Accumulator
-            0x66: self.ROR_zeropage,     # ROR Zero Page
-            0x76: self.ROR_zeropageX,    # ROR Zero Page,X
-            0x6E: self.ROR_absolute,     # ROR Absolute
-            0x7E: self.ROR_absoluteX,    # ROR Absolute,X
+            0x6A: cls.ROR_accumulator,  # ROR Accumulator
+            0x66: cls.ROR_zeropage,     # ROR Zero Page
+            0x76: cls.ROR_zeropageX,    # ROR Zero Page,X
+            0x6E: cls.ROR_absolute,     # ROR Absolute
+            0x7E: cls.ROR_absoluteX,    # ROR Absolute,X
             
             # Jumps & Calls
-            0x4C: self.JMP_absolute,   # JMP Absolute
-            0x6C: self.JMP_indirect,   # JMP Indirect
-            0x20: self.JSR_absolute,   # JSR Absolute
-            0x60: self.RTS,            # RTS
+            0x4C: cls.JMP_absolute,   # JMP Absolute
+            0x6C: cls.JMP_indirect,   # JMP Indirect
+            0x20: cls.JSR_absolute,   # JSR Absolute
+            0x60: cls.RTS,            # RTS
             
             # Branches
-            0x90: self.BCC,  # BCC
-            0xB0: self.BCS,  # BCS
-            0xF0: self.BEQ,  # BEQ
-            0x30: self.BMI,  # BMI
-            0xD0: self.BNE,  # BNE
-            0x10: self.BPL,  # BPL
-            0x50: self.BVC,  # BVC
-            0x70: self.BVS,  # BVS
+            0x90: cls.BCC,  # BCC
+            0xB0: cls.BCS,  # BCS
+            0xF0: cls.BEQ,  # BEQ
+            0x30: cls.BMI,  # BMI
+            0xD0: cls.BNE,  # BNE
+            0x10: cls.BPL,  # BPL
+            0x50: cls.BVC,  # BVC
+            0x70: cls.BVS,  # BVS
             
             # Status Flag Changes
-            0x18: self.CLC,  # CLC
-            0x38: self.SEC,  # SEC
-            0x58: self.CLI,  # CLI
-            0x78: self.SEI,  # SEI
-            0xB8: self.CLV,  # CLV
-            0xD8: self.CLD,  # CLD
-            0xF8: self.SED,  # SED
+            0x18: cls.CLC,  # CLC
+            0x38: cls.SEC,  # SEC
+            0x58: cls.CLI,  # CLI
+            0x78: cls.SEI,  # SEI
+            0xB8: cls.CLV,  # CLV
+            0xD8: cls.CLD,  # CLD
+            0xF8: cls.SED,  # SED
             
             # System Functions
-            0x00: self.BRK,  # BRK
-            0x40: self.RTI,  # RTI
-            0xEA: self.NOP,  # NOP
+            0x00: cls.BRK,  # BRK
+            0x40: cls.RTI,  # RTI
+            0xEA: cls.NOP,  # NOP
         }
+        
+        cls.HANDLERS = [cls._illegal] * 256
+        for opcode, handler in opcodes.items():
+            cls.HANDLERS[opcode] = handler
+    
+    # Individual status flags, for debugging and external callers
+    I = _status_flag(FLAG_I, "Interrupt disable flag.")
+    D = _status_flag(FLAG_D, "Decimal mode flag.")
+    
+    @property
+    def C(self) -> int:
+        """Carry flag."""
+        return self._c >> 8
+    
+    @C.setter
+    def C(self, value: int) -> None:
+        self._c = 0x100 if value else 0
+    
+    @property
+    def V(self) -> int:
+        """Overflow flag."""
+        return 1 if self._v & 0x80 else 0
+    
+    @V.setter
+    def V(self, value: int) -> None:
+        self._v = 0x80 if value else 0
+    
+    @property
+    def Z(self) -> int:
+        """Zero flag."""
+        return 0 if self._zn & 0xFF else 1
+    
+    @Z.setter
+    def Z(self, value: int) -> None:
+        self.set_status((self.get_status() & ~FLAG_Z) | (FLAG_Z if value else 0))
+    
+    @property
+    def N(self) -> int:
+        """Negative flag."""
+        return 1 if self._zn & 0x180 else 0
+    
+    @N.setter
+    def N(self, value: int) -> None:
+        self.set_status((self.get_status() & ~FLAG_N) | (FLAG_N if value else 0))
     
     def get_status(self) -> int:
         """Get the processor status as a byte."""
-        status = (self.C | (self.Z << 1) | (self.I << 2) | (self.D << 3) |
-                 (1 << 5) | (self.V << 6) | (self.N << 7))  # Bit 5 always set
-        return status
+        # Bit 5 always set
+        return (self.P | FLAG_U | ZN_FLAGS[self._zn]
+                | self._c >> 8 | (self._v & 0x80) >> 1)
     
     def set_status(self, value: int) -> None:
         """Set the processor status from a byte."""
-        self.C = value & 1
-        self.Z = (value >> 1) & 1
-        self.I = (value >> 2) & 1
-        self.D = (value >> 3) & 1
-        self.B = (value >> 4) & 1  # Unused in actual 6502
-        # Bit 5 ignored (always 1)
-        self.V = (value >> 6) & 1
-        self.N = (value >> 7) & 1
+        # B and bit 5 are not real flip-flops on the 6502
+        self.P = (value & (FLAG_I | FLAG_D)) | FLAG_U
+        self._zn = ((value & FLAG_Z) ^ FLAG_Z) >> 1 | (value & FLAG_N) << 1
+        self._c = (value & FLAG_C) << 8
+        self._v = (value & FLAG_V) << 1
     
     def update_ZN(self, value: int) -> None:
-        """Update Zero and Negative flags based on value."""
-        self.Z = 1 if (value & 0xFF) == 0 else 0
-        self.N = 1 if (value & 0x80) else 0
-    
-    # === Addressing Modes ===
-    def immediate(self, memory) -> int:
-        """Immediate addressing mode."""
-        value = memory.read(self.PC)
-        self.PC += 1
-        return value
-    
-    def zeropage(self, memory) -> int:
-        """Zero page addressing mode."""
-        addr = memory.read(self.PC)
-        self.PC += 1
-        return addr
-    
-    def zeropageX(self, memory) -> int:
-        """Zero page with X offset addressing mode."""
-        addr = (memory.read(self.PC) + self.X) & 0xFF
-        self.PC += 1
-        return addr
-    
-    def zeropageY(self, memory) -> int:
-        """Zero page with Y offset addressing mode."""
-        addr = (memory.read(self.PC) + self.Y) & 0xFF
-        self.PC += 1
-        return addr
-    
-    def absolute(self, memory) -> int:
-        """Absolute addressing mode."""
-        low = memory.read(self.PC)
-        self.PC += 1
-        high = memory.read(self.PC)
-        self.PC += 1
-        return (high << 8) | low
-    
-    def absoluteX(self, memory, check_page_cross=True) -> Tuple[int, bool]:
-        """Absolute with X offset addressing mode."""
-        low = memory.read(self.PC)
-        self.PC += 1
-        high = memory.read(self.PC)
-        self.PC += 1
-        
-        base = (high << 8) | low
-        addr = (base + self.X) & 0xFFFF
-        
-        # Check page crossing (adds a cycle if crossed)
-        page_crossed = False
-        if check_page_cross:
-            page_crossed = (base & 0xFF00) != (addr & 0xFF00)
-        
-        return addr, page_crossed
-    
-    def absoluteY(self, memory, check_page_cross=True) -> Tuple[int, bool]:
-        """Absolute with Y offset addressing mode."""
-        low = memory.read(self.PC)
-        self.PC += 1
-        high = memory.read(self.PC)
-        self.PC += 1
-        
-        base = (high << 8) | low
-        addr = (base + self.Y) & 0xFFFF
-        
-        # Check page crossing (adds a cycle if crossed)
-        page_crossed = False
-        if check_page_cross:
-            page_crossed = (base & 0xFF00) != (addr & 0xFF00)
-        
-        return addr, page_crossed
-    
-    def indirect(self, memory) -> int:
-        """Indirect addressing mode (JMP only)."""
-        addr_ptr = self.absolute(memory)
-        
-        # 6502 bug: If address is on page boundary, high byte is fetched from
-        # start of the page rather than next page
-        if (addr_ptr & 0xFF) == 0xFF:
-            low = memory.read(addr_ptr)
-            high = memory.read(addr_ptr & 0xFF00)
-        else:
-            low = memory.read(addr_ptr)
-            high = memory.read(addr_ptr + 1)
-        
-        return (high << 8) | low
-    
-    def indirectX(self, memory) -> int:
-        """Pre-indexed indirect addressing mode."""
-        ptr = (memory.read(self.PC) + self.X) & 0xFF
-        self.PC += 1
-        
-        # Wraparound in zero page
-        low = memory.read(ptr & 0xFF)
-        high = memory.read((ptr + 1) & 0xFF)
-        
-        return (high << 8) | low
-    
-    def indirectY(self, memory, check_page_cross=True) -> Tuple[int, bool]:
-        """Post-indexed indirect addressing mode."""
-        ptr = memory.read(self.PC)
-        self.PC += 1
-        
-        # Wraparound in zero page
-        low = memory.read(ptr & 0xFF)
-        high = memory.read((ptr + 1) & 0xFF)
-        
-        base = (high << 8) | low
-        addr = (base + self.Y) & 0xFFFF
-        
-        # Check page crossing (adds a cycle if crossed)
-        page_crossed = False
-        if check_page_cross:
-            page_crossed = (base & 0xFF00) != (addr & 0xFF00)
-        
-        return addr, page_crossed
+        """Update Zero and Negative flags based on a byte value."""
+        self._zn = value
     
     # === Instruction Implementation ===
-    # Load/Store Operations
-    def LDA_immediate(self, memory) -> None:
-        self.A = self.immediate(memory)
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def LDA_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        self.A = memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 3
-    
-    def LDA_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        self.A = memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4
-    
-    def LDA_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        self.A = memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4
-    
-    def LDA_absoluteX(self, memory) -> None:
-        addr, page_crossed = self.absoluteX(memory)
-        self.A = memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def LDA_absoluteY(self, memory) -> None:
-        addr, page_crossed = self.absoluteY(memory)
-        self.A = memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def LDA_indirectX(self, memory) -> None:
-        addr = self.indirectX(memory)
-        self.A = memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 6
-    
-    def LDA_indirectY(self, memory) -> None:
-        addr, page_crossed = self.indirectY(memory)
-        self.A = memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 5 + (1 if page_crossed else 0)
-    
-    def LDX_immediate(self, memory) -> None:
-        self.X = self.immediate(memory)
-        self.update_ZN(self.X)
-        self.cycles += 2
-    
-    def LDX_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        self.X = memory.read(addr)
-        self.update_ZN(self.X)
-        self.cycles += 3
-    
-    def LDX_zeropageY(self, memory) -> None:
-        addr = self.zeropageY(memory)
-        self.X = memory.read(addr)
-        self.update_ZN(self.X)
-        self.cycles += 4
-    
-    def LDX_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        self.X = memory.read(addr)
-        self.update_ZN(self.X)
-        self.cycles += 4
-    
-    def LDX_absoluteY(self, memory) -> None:
-        addr, page_crossed = self.absoluteY(memory)
-        self.X = memory.read(addr)
-        self.update_ZN(self.X)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def LDY_immediate(self, memory) -> None:
-        self.Y = self.immediate(memory)
-        self.update_ZN(self.Y)
-        self.cycles += 2
-    
-    def LDY_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        self.Y = memory.read(addr)
-        self.update_ZN(self.Y)
-        self.cycles += 3
-    
-    def LDY_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        self.Y = memory.read(addr)
-        self.update_ZN(self.Y)
-        self.cycles += 4
-    
-    def LDY_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        self.Y = memory.read(addr)
-        self.update_ZN(self.Y)
-        self.cycles += 4
-    
-    def LDY_absoluteX(self, memory) -> None:
-        addr, page_crossed = self.absoluteX(memory)
-        self.Y = memory.read(addr)
-        self.update_ZN(self.Y)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def STA_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        memory.write(addr, self.A)
-        self.cycles += 3
-    
-    def STA_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        memory.write(addr, self.A)
-        self.cycles += 4
-    
-    def STA_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        memory.write(addr, self.A)
-        self.cycles += 4
-    
-    def STA_absoluteX(self, memory) -> None:
-        addr, _ = self.absoluteX(memory, False)  # No page crossing check for stores
-        memory.write(addr, self.A)
-        self.cycles += 5  # Always 5 cycles
-    
-    def STA_absoluteY(self, memory) -> None:
-        addr, _ = self.absoluteY(memory, False)  # No page crossing check for stores
-        memory.write(addr, self.A)
-        self.cycles += 5  # Always 5 cycles
-    
-    def STA_indirectX(self, memory) -> None:
-        addr = self.indirectX(memory)
-        memory.write(addr, self.A)
-        self.cycles += 6
-    
-    def STA_indirectY(self, memory) -> None:
-        addr, _ = self.indirectY(memory, False)  # No page crossing check for stores
-        memory.write(addr, self.A)
-        self.cycles += 6  # Always 6 cycles
-    
-    def STX_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        memory.write(addr, self.X)
-        self.cycles += 3
-    
-    def STX_zeropageY(self, memory) -> None:
-        addr = self.zeropageY(memory)
-        memory.write(addr, self.X)
-        self.cycles += 4
-    
-    def STX_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        memory.write(addr, self.X)
-        self.cycles += 4
-    
-    def STY_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        memory.write(addr, self.Y)
-        self.cycles += 3
-    
-    def STY_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        memory.write(addr, self.Y)
-        self.cycles += 4
-    
-    def STY_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        memory.write(addr, self.Y)
-        self.cycles += 4
+    @classmethod
+    def _codegen_handlers(cls) -> None:
+        """Generate the load/store, ALU and read-modify-write handlers.
+        
+        Every (operation, addressing mode) pair in _GENERATED_HANDLERS gets
+        its own method with the addressing mode inlined, so the hot path makes
+        no helper calls. Base cycles come from CYCLES; only the page-crossing
+        penalty is returned here.
+        
+        Each of these also gets a ``<op>_<mode>_decoded`` variant for
+        predecode() that takes its operand bytes as an int instead of
+        fetching them, listed in DECODED_HANDLERS by the name of the plain
+        handler along with its operand length.
+        
+        Each branch in _BRANCH_CONDITIONS gets a handler with its condition
+        inlined, plus a ``<op>_resolved`` variant for predecode() taking the
+        target and taken-branch cycles packed as ``target | cycles << 16``
+        instead of reading its offset.
+        """
+        cls.DECODED_HANDLERS = {}
+        for op, modes in _GENERATED_HANDLERS.items():
+            store = op in _STORE_OPS
+            writes = store or op in _RMW_OPS
+            for mode in modes:
+                name = f"{op}_{mode}"
+                body = []
+                if op in _RMW_OPS:
+                    # Plain RAM is modified in place; anything else goes
+                    # through memory.read() and memory.write()
+                    op_source = textwrap.indent(_OP_SOURCE[op], "    ")
+                    body.append("if direct_map[addr]:\n"
+                                "    value = ram[addr]\n"
+                                f"{op_source}"
+                                "    ram[addr] = value\n"
+                                "else:\n"
+                                "    value = memory.read(addr)\n"
+                                f"{op_source}"
+                                "    memory.write(addr, value)\n")
+                elif mode != 'immediate' and not store:
+                    body.append("value = read(addr)")
+                    body.append(_OP_SOURCE[op])
+                else:
+                    body.append(_OP_SOURCE[op])
+                if mode in _PAGE_CROSSING_MODES and not writes:
+                    body.append("return ((base ^ addr) >> 8) & 1")
+                else:
+                    body.append("return 0")
+                
+                variants = (
+                    (name, "self, memory", _MODE_SOURCE[mode],
+                     f"{op} {mode} (generated)."),
+                    (f"{name}_decoded", "self, memory, operand", _DECODED_MODE_SOURCE[mode],
+                     f"{op} {mode} with a predecoded operand (generated)."),
+                )
+                for variant, params, mode_source, doc in variants:
+                    lines = [mode_source] + body
+                    
+                    # Bind only the memory accessors the body uses
+                    text = "".join(lines)
+                    if re.search(r"(?<!\.)write\(", text):
+                        lines.insert(0, "write = memory.write")
+                    if re.search(r"(?<!\.)read\(", text):
+                        lines.insert(0, "read = memory.read")
+                    if "direct_map[" in text:
+                        lines.insert(0, "direct_map = memory.direct_map")
+                    if "ram[" in text:
+                        lines.insert(0, "ram = memory.ram")
+                    if "pc" in re.findall(r"\w+", text):
+                        lines.insert(0, "pc = self.PC")
+                    
+                    source = f"def {variant}({params}) -> int:\n"
+                    for chunk in lines:
+                        for line in chunk.splitlines():
+                            source += f"    {line}\n"
+                    
+                    namespace = {}
+                    exec(compile(source, f"<{cls.__name__}.{variant}>", "exec"), globals(), namespace)
+                    handler = namespace[variant]
+                    handler.__qualname__ = f"{cls.__name__}.{variant}"
+                    handler.__doc__ = doc
+                    setattr(cls, variant, handler)
+                
+                cls.DECODED_HANDLERS[name] = (getattr(cls, f"{name}_decoded"),
+                                              _OPERAND_BYTES[mode])
+        
+        for op, condition in _BRANCH_CONDITIONS.values():
+            # Not taken: skip the offset byte without reading it. Taken: +1
+            # cycle, +1 more if the target is on another page.
+            sources = {
+                op: (f"def {op}(self, memory) -> int:\n"
+                     f"    pc = self.PC\n"
+                     f"    if {condition}:\n"
+                     f"        next_pc = pc + 1\n"
+                     f"        self.PC = target = (next_pc + ((memory.ram[pc] ^ 0x80) - 0x80)) & 0xFFFF\n"
+                     f"        return 1 + (((next_pc ^ target) >> 8) & 1)\n"
+                     f"    self.PC = (pc + 1) & 0xFFFF\n"
+                     f"    return 0\n",
+                     f"{op} relative (generated)."),
+                f"{op}_resolved": (
+                    f"def {op}_resolved(self, memory, operand) -> int:\n"
+                    f"    if {condition}:\n"
+                    f"        self.PC = operand & 0xFFFF\n"
+                    f"        return operand >> 16\n"
+                    f"    self.PC += 1\n"
+                    f"    return 0\n",
+                    f"{op} with a predecoded target (generated)."),
+            }
+            for name, (source, doc) in sources.items():
+                namespace = {}
+                exec(compile(source, f"<{cls.__name__}.{name}>", "exec"), globals(), namespace)
+                handler = namespace[name]
+                handler.__qualname__ = f"{cls.__name__}.{name}"
+                handler.__doc__ = doc
+                setattr(cls, name, handler)
     
     # Register Transfers
-    def TAX(self, memory) -> None:
-        self.X = self.A
-        self.update_ZN(self.X)
-        self.cycles += 2
-    
-    def TXA(self, memory) -> None:
-        self.A = self.X
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def TAY(self, memory) -> None:
-        self.Y = self.A
-        self.update_ZN(self.Y)
-        self.cycles += 2
-    
-    def TYA(self, memory) -> None:
-        self.A = self.Y
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def TSX(self, memory) -> None:
-        self.X = self.SP
-        self.update_ZN(self.X)
-        self.cycles += 2
-    
-    def TXS(self, memory) -> None:
+    def TAX(self, memory) -> int:
+        self.X = self._zn = self.A
+        return 0
+    
+    def TXA(self, memory) -> int:
+        self.A = self._zn = self.X
+        return 0
+    
+    def TAY(self, memory) -> int:
+        self.Y = self._zn = self.A
+        return 0
+    
+    def TYA(self, memory) -> int:
+        self.A = self._zn = self.Y
+        return 0
+    
+    def TSX(self, memory) -> int:
+        self.X = self._zn = self.SP
+        return 0
+    
+    def TXS(self, memory) -> int:
         self.SP = self.X
-        self.cycles += 2  # Note: flags not affected
+        return 0
     
-    # Stack Operations
-    def PHA(self, memory) -> None:
-        memory.write(0x100 + self.SP, self.A)
+    # Stack Operations. The stack page is always plain RAM, so pushes and
+    # pulls index memory.ram directly instead of going through read/write.
+    def PHA(self, memory) -> int:
+        memory.ram[0x100 | self.SP] = self.A
         self.SP = (self.SP - 1) & 0xFF
-        self.cycles += 3
+        return 0
     
-    def PLA(self, memory) -> None:
-        self.SP = (self.SP + 1) & 0xFF
-        self.A = memory.read(0x100 + self.SP)
-        self.update_ZN(self.A)
-        self.cycles += 4
+    def PLA(self, memory) -> int:
+        self.SP = sp = (self.SP + 1) & 0xFF
+        self.A = self._zn = memory.ram[0x100 | sp]
+        return 0
     
-    def PHP(self, memory) -> None:
+    def PHP(self, memory) -> int:
         # Push status with B flag set
-        status = self.get_status() | 0x10  # Set B flag
-        memory.write(0x100 + self.SP, status)
+        memory.ram[0x100 | self.SP] = self.get_status() | FLAG_B
         self.SP = (self.SP - 1) & 0xFF
-        self.cycles += 3
-    
-    def PLP(self, memory) -> None:
-        self.SP = (self.SP + 1) & 0xFF
-        status = memory.read(0x100 + self.SP)
-        self.set_status(status)
-        self.cycles += 4
+        return 0
     
-    # Logical Operations
-    def AND_immediate(self, memory) -> None:
-        self.A &= self.immediate(memory)
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def AND_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        self.A &= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 3
-    
-    def AND_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        self.A &= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4
-    
-    def AND_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        self.A &= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4
-    
-    def AND_absoluteX(self, memory) -> None:
-        addr, page_crossed = self.absoluteX(memory)
-        self.A &= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def AND_absoluteY(self, memory) -> None:
-        addr, page_crossed = self.absoluteY(memory)
-        self.A &= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def AND_indirectX(self, memory) -> None:
-        addr = self.indirectX(memory)
-        self.A &= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 6
-    
-    def AND_indirectY(self, memory) -> None:
-        addr, page_crossed = self.indirectY(memory)
-        self.A &= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 5 + (1 if page_crossed else 0)
-    
-    def ORA_immediate(self, memory) -> None:
-        self.A |= self.immediate(memory)
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def ORA_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        self.A |= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 3
-    
-    def ORA_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        self.A |= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4
-    
-    def ORA_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        self.A |= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4
-    
-    def ORA_absoluteX(self, memory) -> None:
-        addr, page_crossed = self.absoluteX(memory)
-        self.A |= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def ORA_absoluteY(self, memory) -> None:
-        addr, page_crossed = self.absoluteY(memory)
-        self.A |= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def ORA_indirectX(self, memory) -> None:
-        addr = self.indirectX(memory)
-        self.A |= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 6
-    
-    def ORA_indirectY(self, memory) -> None:
-        addr, page_crossed = self.indirectY(memory)
-        self.A |= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 5 + (1 if page_crossed else 0)
-    
-    def EOR_immediate(self, memory) -> None:
-        self.A ^= self.immediate(memory)
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def EOR_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        self.A ^= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 3
-    
-    def EOR_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        self.A ^= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4
-    
-    def EOR_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        self.A ^= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4
-    
-    def EOR_absoluteX(self, memory) -> None:
-        addr, page_crossed = self.absoluteX(memory)
-        self.A ^= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def EOR_absoluteY(self, memory) -> None:
-        addr, page_crossed = self.absoluteY(memory)
-        self.A ^= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def EOR_indirectX(self, memory) -> None:
-        addr = self.indirectX(memory)
-        self.A ^= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 6
-    
-    def EOR_indirectY(self, memory) -> None:
-        addr, page_crossed = self.indirectY(memory)
-        self.A ^= memory.read(addr)
-        self.update_ZN(self.A)
-        self.cycles += 5 + (1 if page_crossed else 0)
-    
-    def BIT_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        self.Z = 1 if (self.A & value) == 0 else 0
-        self.V = (value >> 6) & 1
-        self.N = (value >> 7) & 1
-        self.cycles += 3
-    
-    def BIT_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        self.Z = 1 if (self.A & value) == 0 else 0
-        self.V = (value >> 6) & 1
-        self.N = (value >> 7) & 1
-        self.cycles += 4
+    def PLP(self, memory) -> int:
+        self.SP = sp = (self.SP + 1) & 0xFF
+        self.set_status(memory.ram[0x100 | sp])
+        return 0
     
     # Arithmetic Operations
-    def ADC_immediate(self, memory) -> None:
-        value = self.immediate(memory)
-        self._add_with_carry(value)
-        self.cycles += 2
-    
-    def ADC_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        self._add_with_carry(value)
-        self.cycles += 3
-    
-    def ADC_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = memory.read(addr)
-        self._add_with_carry(value)
-        self.cycles += 4
-    
-    def ADC_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        self._add_with_carry(value)
-        self.cycles += 4
-    
-    def ADC_absoluteX(self, memory) -> None:
-        addr, page_crossed = self.absoluteX(memory)
-        value = memory.read(addr)
-        self._add_with_carry(value)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def ADC_absoluteY(self, memory) -> None:
-        addr, page_crossed = self.absoluteY(memory)
-        value = memory.read(addr)
-        self._add_with_carry(value)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def ADC_indirectX(self, memory) -> None:
-        addr = self.indirectX(memory)
-        value = memory.read(addr)
-        self._add_with_carry(value)
-        self.cycles += 6
-    
-    def ADC_indirectY(self, memory) -> None:
-        addr, page_crossed = self.indirectY(memory)
-        value = memory.read(addr)
-        self._add_with_carry(value)
-        self.cycles += 5 + (1 if page_crossed else 0)
-    
     def _add_with_carry(self, value: int) -> None:
         """Implements ADC logic with decimal mode support."""
-        if self.D:  # Decimal mode
-            # BCD addition
-            a_lo = self.A & 0x0F
-            a_hi = self.A >> 4
-            val_lo = value & 0x0F
-            val_hi = value >> 4
-            
-            # Add low nibbles
-            result_lo = a_lo + val_lo + self.C
-            if result_lo > 9:
-                result_lo += 6
-                result_lo &= 0x0F
-                carry_lo = 1
-            else:
-                carry_lo = 0
-                
-            # Add high nibbles
-            result_hi = a_hi + val_hi + carry_lo
-            if result_hi > 9:
-                result_hi += 6
-                result_hi &= 0x0F
-                self.C = 1
-            else:
-                self.C = 0
-                
-            # Final result
-            result = (result_hi << 4) | result_lo
-            
-            # Set flags
-            self.Z = 1 if (result & 0xFF) == 0 else 0
-            self.N = 1 if (result & 0x80) else 0
-            
-            # V flag is complicated in decimal mode, simplify here
-            self.V = 0  # Simplified
+        if self.P & FLAG_D:  # Decimal mode
+            index = (self.A << 9) | (value << 1) | (self._c >> 8)
+            packed = BCD_ADD[index]
+            self.A = self._zn = packed & 0xFF
+            self._c = packed & 0x1FF
+            self._v = packed >> 2
             
         else:  # Binary mode
-            temp = self.A + value + self.C
-            
-            # Set carry flag if result > 255
-            self.C = 1 if temp > 0xFF else 0
+            a = self.A
+            temp = a + value + (self._c >> 8)
             
-            # Set overflow flag if sign bit changes incorrectly
-            self.V = 1 if ((~(self.A ^ value) & (self.A ^ temp)) & 0x80) else 0
+            # Carry if result > 255, overflow if sign bit changes incorrectly
+            self._c = temp
+            self._v = ~(a ^ value) & (a ^ temp)
             
             # Set result and update flags
             self.A = temp & 0xFF
-            self.update_ZN(self.A)
-    
-    def SBC_immediate(self, memory) -> None:
-        value = self.immediate(memory)
-        self._subtract_with_carry(value)
-        self.cycles += 2
-    
-    def SBC_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        self._subtract_with_carry(value)
-        self.cycles += 3
-    
-    def SBC_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = memory.read(addr)
-        self._subtract_with_carry(value)
-        self.cycles += 4
-    
-    def SBC_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        self._subtract_with_carry(value)
-        self.cycles += 4
-    
-    def SBC_absoluteX(self, memory) -> None:
-        addr, page_crossed = self.absoluteX(memory)
-        value = memory.read(addr)
-        self._subtract_with_carry(value)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def SBC_absoluteY(self, memory) -> None:
-        addr, page_crossed = self.absoluteY(memory)
-        value = memory.read(addr)
-        self._subtract_with_carry(value)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def SBC_indirectX(self, memory) -> None:
-        addr = self.indirectX(memory)
-        value = memory.read(addr)
-        self._subtract_with_carry(value)
-        self.cycles += 6
-    
-    def SBC_indirectY(self, memory) -> None:
-        addr, page_crossed = self.indirectY(memory)
-        value = memory.read(addr)
-        self._subtract_with_carry(value)
-        self.cycles += 5 + (1 if page_crossed else 0)
+            self._zn = self.A
     
     def _subtract_with_carry(self, value: int) -> None:
         """Implements SBC logic with decimal mode support."""
-        # SBC is basically ADC with inverted value
-        if self.D:  # Decimal mode
-            # BCD subtraction with borrow
-            a_lo = self.A & 0x0F
-            a_hi = self.A >> 4
-            val_lo = value & 0x0F
-            val_hi = value >> 4
-            
-            borrow = 1 - self.C  # Convert carry to borrow
-            
-            # Subtract low nibbles
-            result_lo = a_lo - val_lo - borrow
-            if result_lo < 0:
-                result_lo += 10
-                borrow_lo = 1
-            else:
-                borrow_lo = 0
-                
-            # Subtract high nibbles
-            result_hi = a_hi - val_hi - borrow_lo
-            if result_hi < 0:
-                result_hi += 10
-                self.C = 0
-            else:
-                self.C = 1
-                
-            # Final result
-            result = (result_hi << 4) | result_lo
-            
-            # Set flags
-            self.Z = 1 if (result & 0xFF) == 0 else 0
-            self.N = 1 if (result & 0x80) else 0
-            
-            # V flag is complicated in decimal mode, simplify here
-            self.V = 0  # Simplified
+        if self.P & FLAG_D:  # Decimal mode
+            index = (self.A << 9) | (value << 1) | (self._c >> 8)
+            packed = BCD_SUB[index]
+            self.A = self._zn = packed & 0xFF
+            self._c = packed & 0x1FF
+            self._v = packed >> 2
             
         else:  # Binary mode
             # Invert bits and add (A - M - !C = A + ~M + C)
             self._add_with_carry(value ^ 0xFF)
     
-    def CMP_immediate(self, memory) -> None:
-        value = self.immediate(memory)
-        self._compare(self.A, value)
-        self.cycles += 2
-    
-    def CMP_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        self._compare(self.A, value)
-        self.cycles += 3
-    
-    def CMP_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = memory.read(addr)
-        self._compare(self.A, value)
-        self.cycles += 4
-    
-    def CMP_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        self._compare(self.A, value)
-        self.cycles += 4
-    
-    def CMP_absoluteX(self, memory) -> None:
-        addr, page_crossed = self.absoluteX(memory)
-        value = memory.read(addr)
-        self._compare(self.A, value)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def CMP_absoluteY(self, memory) -> None:
-        addr, page_crossed = self.absoluteY(memory)
-        value = memory.read(addr)
-        self._compare(self.A, value)
-        self.cycles += 4 + (1 if page_crossed else 0)
-    
-    def CMP_indirectX(self, memory) -> None:
-        addr = self.indirectX(memory)
-        value = memory.read(addr)
-        self._compare(self.A, value)
-        self.cycles += 6
-    
-    def CMP_indirectY(self, memory) -> None:
-        addr, page_crossed = self.indirectY(memory)
-        value = memory.read(addr)
-        self._compare(self.A, value)
-        self.cycles += 5 + (1 if page_crossed else 0)
-    
-    def CPX_immediate(self, memory) -> None:
-        value = self.immediate(memory)
-        self._compare(self.X, value)
-        self.cycles += 2
-    
-    def CPX_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        self._compare(self.X, value)
-        self.cycles += 3
-    
-    def CPX_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        self._compare(self.X, value)
-        self.cycles += 4
-    
-    def CPY_immediate(self, memory) -> None:
-        value = self.immediate(memory)
-        self._compare(self.Y, value)
-        self.cycles += 2
-    
-    def CPY_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        self._compare(self.Y, value)
-        self.cycles += 3
-    
-    def CPY_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        self._compare(self.Y, value)
-        self.cycles += 4
-    
-    def _compare(self, reg: int, value: int) -> None:
-        """Implement comparison logic for CMP, CPX, CPY instructions."""
-        result = (reg - value) & 0xFF
-        self.C = 1 if reg >= value else 0
-        self.Z = 1 if reg == value else 0
-        self.N = 1 if result & 0x80 else 0
-    
     # Increments & Decrements
-    def INC_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = (memory.read(addr) + 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 5
-    
-    def INC_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = (memory.read(addr) + 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def INC_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = (memory.read(addr) + 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def INC_absoluteX(self, memory) -> None:
-        addr, _ = self.absoluteX(memory, False)
-        value = (memory.read(addr) + 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 7
-    
-    def INX(self, memory) -> None:
-        self.X = (self.X + 1) & 0xFF
-        self.update_ZN(self.X)
-        self.cycles += 2
-    
-    def INY(self, memory) -> None:
-        self.Y = (self.Y + 1) & 0xFF
-        self.update_ZN(self.Y)
-        self.cycles += 2
-    
-    def DEC_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = (memory.read(addr) - 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 5
-    
-    def DEC_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = (memory.read(addr) - 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def DEC_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = (memory.read(addr) - 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def DEC_absoluteX(self, memory) -> None:
-        addr, _ = self.absoluteX(memory, False)
-        value = (memory.read(addr) - 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 7
-    
-    def DEX(self, memory) -> None:
-        self.X = (self.X - 1) & 0xFF
-        self.update_ZN(self.X)
-        self.cycles += 2
-    
-    def DEY(self, memory) -> None:
-        self.Y = (self.Y - 1) & 0xFF
-        self.update_ZN(self.Y)
-        self.cycles += 2
+    def INX(self, memory) -> int:
+        self.X = self._zn = (self.X + 1) & 0xFF
+        return 0
     
-    # Shifts & Rotates
-    def ASL_accumulator(self, memory) -> None:
-        self.C = (self.A >> 7) & 1
-        self.A = (self.A << 1) & 0xFF
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def ASL_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        self.C = (value >> 7) & 1
-        value = (value << 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 5
-    
-    def ASL_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = memory.read(addr)
-        self.C = (value >> 7) & 1
-        value = (value << 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def ASL_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        self.C = (value >> 7) & 1
-        value = (value << 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def ASL_absoluteX(self, memory) -> None:
-        addr, _ = self.absoluteX(memory, False)
-        value = memory.read(addr)
-        self.C = (value >> 7) & 1
-        value = (value << 1) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 7
-    
-    def LSR_accumulator(self, memory) -> None:
-        self.C = self.A & 1
-        self.A = self.A >> 1
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def LSR_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        self.C = value & 1
-        value = value >> 1
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 5
-    
-    def LSR_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = memory.read(addr)
-        self.C = value & 1
-        value = value >> 1
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def LSR_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        self.C = value & 1
-        value = value >> 1
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def LSR_absoluteX(self, memory) -> None:
-        addr, _ = self.absoluteX(memory, False)
-        value = memory.read(addr)
-        self.C = value & 1
-        value = value >> 1
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 7
-    
-    def ROL_accumulator(self, memory) -> None:
-        old_carry = self.C
-        self.C = (self.A >> 7) & 1
-        self.A = ((self.A << 1) | old_carry) & 0xFF
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def ROL_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        old_carry = self.C
-        self.C = (value >> 7) & 1
-        value = ((value << 1) | old_carry) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 5
-    
-    def ROL_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = memory.read(addr)
-        old_carry = self.C
-        self.C = (value >> 7) & 1
-        value = ((value << 1) | old_carry) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def ROL_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        old_carry = self.C
-        self.C = (value >> 7) & 1
-        value = ((value << 1) | old_carry) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def ROL_absoluteX(self, memory) -> None:
-        addr, _ = self.absoluteX(memory, False)
-        value = memory.read(addr)
-        old_carry = self.C
-        self.C = (value >> 7) & 1
-        value = ((value << 1) | old_carry) & 0xFF
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 7
-    
-    def ROR_accumulator(self, memory) -> None:
-        old_carry = self.C
-        self.C = self.A & 1
-        self.A = (self.A >> 1) | (old_carry << 7)
-        self.update_ZN(self.A)
-        self.cycles += 2
-    
-    def ROR_zeropage(self, memory) -> None:
-        addr = self.zeropage(memory)
-        value = memory.read(addr)
-        old_carry = self.C
-        self.C = value & 1
-        value = (value >> 1) | (old_carry << 7)
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 5
-    
-    def ROR_zeropageX(self, memory) -> None:
-        addr = self.zeropageX(memory)
-        value = memory.read(addr)
-        old_carry = self.C
-        self.C = value & 1
-        value = (value >> 1) | (old_carry << 7)
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def ROR_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        value = memory.read(addr)
-        old_carry = self.C
-        self.C = value & 1
-        value = (value >> 1) | (old_carry << 7)
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 6
-    
-    def ROR_absoluteX(self, memory) -> None:
-        addr, _ = self.absoluteX(memory, False)
-        value = memory.read(addr)
-        old_carry = self.C
-        self.C = value & 1
-        value = (value >> 1) | (old_carry << 7)
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 7
+    def INY(self, memory) -> int:
+        self.Y = self._zn = (self.Y + 1) & 0xFF
+        return 0
     
-    # Jumps & Calls
-    def JMP_absolute(self, memory) -> None:
-        self.PC = self.absolute(memory)
-        self.cycles += 3
-    
-    def JMP_indirect(self, memory) -> None:
-        self.PC = self.indirect(memory)
-        self.cycles += 5
-    
-    def JSR_absolute(self, memory) -> None:
-        addr = self.absolute(memory)
-        # PC is already pointing to next instruction
-        # Push return address (PC-1) to stack
-        return_addr = self.PC - 1
-        memory.write(0x100 + self.SP, (return_addr >> 8) & 0xFF)  # Push high byte
-        self.SP = (self.SP - 1) & 0xFF
-        memory.write(0x100 + self.SP, return_addr & 0xFF)  # Push low byte
-        self.SP = (self.SP - 1) & 0xFF
-        
-        # Jump to subroutine
-        self.PC = addr
-        self.cycles += 6
+    def DEX(self, memory) -> int:
+        self.X = self._zn = (self.X - 1) & 0xFF
+        return 0
     
-    def RTS(self, memory) -> None:
-        # Pull return address from stack
-        self.SP = (self.SP + 1) & 0xFF
-        low = memory.read(0x100 + self.SP)
-        self.SP = (self.SP + 1) & 0xFF
-        high = memory.read(0x100 + self.SP)
-        
-        # Set PC to return address + 1
-        self.PC = ((high << 8) | low) + 1
-        self.cycles += 6
-    
-    # Branches
-    def _branch(self, memory, condition: bool) -> None:
-        """Common logic for all branch instructions."""
-        offset = self.immediate(memory)
-        if condition:
-            # Calculate new address (signed 8-bit offset)
-            if offset & 0x80:  # Negative offset
-                offset = -(256 - offset)
-            
-            old_pc = self.PC
-            self.PC = (self.PC + offset) & 0xFFFF
-            
-            # +1 cycle if branch taken, +1 more if page crossed
-            self.cycles += 1
-            if (old_pc & 0xFF00) != (self.PC & 0xFF00):
-                self.cycles += 1
-        
-        # Base cycles for branch instructions
-        self.cycles += 2
+    def DEY(self, memory) -> int:
+        self.Y = self._zn = (self.Y - 1) & 0xFF
+        return 0
     
-    def BCC(self, memory) -> None:
-        self._branch(memory, self.C == 0)
+    # Shifts & Rotates
+    def ASL_accumulator(self, memory) -> int:
+        self._c = value = self.A << 1
+        self.A = self._zn = value & 0xFF
+        return 0
     
-    def BCS(self, memory) -> None:
-        self._branch(memory, self.C == 1)
+    def LSR_accumulator(self, memory) -> int:
+        self._c = (self.A & 1) << 8
+        self.A = self._zn = self.A >> 1
+        return 0
     
-    def BEQ(self, memory) -> None:
-        self._branch(memory, self.Z == 1)
+    def ROL_accumulator(self, memory) -> int:
+        self._c = value = (self.A << 1) | (self._c >> 8)
+        self.A = self._zn = value & 0xFF
+        return 0
     
-    def BMI(self, memory) -> None:
-        self._branch(memory, self.N == 1)
+    def ROR_accumulator(self, memory) -> int:
+        value = self.A | (self._c & 0x100)
+        self._c = (value & 1) << 8
+        self.A = self._zn = value >> 1
+        return 0
     
-    def BNE(self, memory) -> None:
-        self._branch(memory, self.Z == 0)
+    # Jumps & Calls
+    def JMP_absolute(self, memory) -> int:
+        pc = self.PC
+        ram = memory.ram
+        self.PC = ram[pc] | (ram[(pc + 1) & 0xFFFF] << 8)
+        return 0
     
-    def BPL(self, memory) -> None:
-        self._branch(memory, self.N == 0)
+    def JMP_indirect(self, memory) -> int:
+        pc = self.PC
+        ram = memory.ram
+        ptr = ram[pc] | (ram[(pc + 1) & 0xFFFF] << 8)
+        # 6502 bug: the high byte is fetched without carrying into the page
+        self.PC = memory.read(ptr) | (memory.read((ptr & 0xFF00) | ((ptr + 1) & 0xFF)) << 8)
+        return 0
     
-    def BVC(self, memory) -> None:
-        self._branch(memory, self.V == 0)
+    def JSR_absolute(self, memory) -> int:
+        pc = self.PC
+        ram = memory.ram
+        addr = ram[pc] | (ram[(pc + 1) & 0xFFFF] << 8)
+        # Push return address (last byte of the JSR) to stack
+        return_addr = pc + 1
+        sp = self.SP
+        ram[0x100 | sp] = (return_addr >> 8) & 0xFF  # Push high byte
+        ram[0x100 | ((sp - 1) & 0xFF)] = return_addr & 0xFF  # Push low byte
+        self.SP = (sp - 2) & 0xFF
+        
+        # Jump to subroutine
+        self.PC = addr
+        return 0
     
-    def BVS(self, memory) -> None:
-        self._branch(memory, self.V == 1)
+    def RTS(self, memory) -> int:
+        # Pull return address from stack
+        ram = memory.ram
+        sp = self.SP
+        low = ram[0x100 | ((sp + 1) & 0xFF)]
+        self.SP = sp = (sp + 2) & 0xFF
+        high = ram[0x100 | sp]
+        
+        # Set PC to return address + 1
+        self.PC = (((high << 8) | low) + 1) & 0xFFFF
+        return 0
     
     # Status Flag Changes
-    def CLC(self, memory) -> None:
-        self.C = 0
-        self.cycles += 2
+    def CLC(self, memory) -> int:
+        self._c = 0
+        return 0
     
-    def SEC(self, memory) -> None:
-        self.C = 1
-        self.cycles += 2
+    def SEC(self, memory) -> int:
+        self._c = 0x100
+        return 0
     
-    def CLI(self, memory) -> None:
-        self.I = 0
-        self.cycles += 2
+    def CLI(self, memory) -> int:
+        self.P &= ~FLAG_I
+        return 0
     
-    def SEI(self, memory) -> None:
-        self.I = 1
-        self.cycles += 2
+    def SEI(self, memory) -> int:
+        self.P |= FLAG_I
+        return 0
     
-    def CLV(self, memory) -> None:
-        self.V = 0
-        self.cycles += 2
+    def CLV(self, memory) -> int:
+        self._v = 0
+        return 0
     
-    def CLD(self, memory) -> None:
-        self.D = 0
-        self.cycles += 2
+    def CLD(self, memory) -> int:
+        self.P &= ~FLAG_D
+        return 0
     
-    def SED(self, memory) -> None:
-        self.D = 1
-        self.cycles += 2
+    def SED(self, memory) -> int:
+        self.P |= FLAG_D
+        return 0
     
     # System Functions
-    def BRK(self, memory) -> None:
+    def BRK(self, memory) -> int:
         # Push PC+1 to stack
-        memory.write(0x100 + self.SP, ((self.PC + 1) >> 8) & 0xFF)
-        self.SP = (self.SP - 1) & 0xFF
-        memory.write(0x100 + self.SP, (self.PC + 1) & 0xFF)
-        self.SP = (self.SP - 1) & 0xFF
+        ram = memory.ram
+        sp = self.SP
+        ram[0x100 | sp] = ((self.PC + 1) >> 8) & 0xFF
+        ram[0x100 | ((sp - 1) & 0xFF)] = (self.PC + 1) & 0xFF
         
         # Push status with B flag set
-        memory.write(0x100 + self.SP, self.get_status() | 0x10)
-        self.SP = (self.SP - 1) & 0xFF
+        ram[0x100 | ((sp - 2) & 0xFF)] = self.get_status() | FLAG_B
+        self.SP = (sp - 3) & 0xFF
         
         # Set I flag
-        self.I = 1
+        self.P |= FLAG_I
         
         # Load interrupt vector
         self.PC = memory.read(0xFFFE) | (memory.read(0xFFFF) << 8)
-        self.cycles += 7
+        return 0
     
-    def RTI(self, memory) -> None:
+    def RTI(self, memory) -> int:
         # Pull status
-        self.SP = (self.SP + 1) & 0xFF
-        self.set_status(memory.read(0x100 + self.SP))
+        ram = memory.ram
+        sp = self.SP
+        self.set_status(ram[0x100 | ((sp + 1) & 0xFF)])
         
         # Pull PC
-        self.SP = (self.SP + 1) & 0xFF
-        low = memory.read(0x100 + self.SP)
-        self.SP = (self.SP + 1) & 0xFF
-        high = memory.read(0x100 + self.SP)
+        low = ram[0x100 | ((sp + 2) & 0xFF)]
+        self.SP = sp = (sp + 3) & 0xFF
+        high = ram[0x100 | sp]
         
         self.PC = (high << 8) | low
-        self.cycles += 6
+        return 0
     
-    def NOP(self, memory) -> None:
-        self.cycles += 2
+    def NOP(self, memory) -> int:
+        return 0
+    
+    def _illegal(self, memory) -> int:
+        # Handle illegal opcodes as NOP
+        return 0
+    
+    # Superinstructions: common pairs in ROM run as one dispatch by
+    # execute(). Each is entered with PC just past the first opcode and gets
+    # its operands from predecode().
+    def LDA_immediate_STA_zeropage(self, memory, operand) -> int:
+        self.A = self._zn = operand & 0xFF
+        self.PC += 3
+        memory.write(operand >> 8, self.A)
+        return 0
+    
+    def CLC_ADC_immediate(self, memory, operand) -> int:
+        self._c = 0
+        self.PC += 2
+        self._add_with_carry(operand)
+        return 0
+    
+    def INX_BNE(self, memory, operand) -> int:
+        self.X = self._zn = (self.X + 1) & 0xFF
+        if self.X:
+            self.PC = operand & 0xFFFF
+            return operand >> 16
+        self.PC += 2
+        return 0
+    
+    def DEX_BNE(self, memory, operand) -> int:
+        self.X = self._zn = (self.X - 1) & 0xFF
+        if self.X:
+            self.PC = operand & 0xFFFF
+            return operand >> 16
+        self.PC += 2
+        return 0
+    
+    @staticmethod
+    def _resolve_branch(memory, addr: int) -> int:
+        """Pack the target and taken-branch cycles of the branch at addr."""
+        next_pc = addr + 2
+        target = (next_pc + ((memory.read(addr + 1) ^ 0x80) - 0x80)) & 0xFFFF
+        
+        # +1 cycle if branch taken, +1 more if page crossed
+        return target | (1 + (((next_pc ^ target) >> 8) & 1)) << 16
+    
+    def predecode(self, memory) -> None:
+        """Predecode the instructions found in ROM.
+        
+        Entries in fast_dispatch are (handler, base cycles, operand) with the
+        operand bytes already fetched and branch targets already resolved.
+        Branches, fusable instruction pairs and the generated load/store, ALU
+        and read-modify-write handlers are mapped; other instructions are
+        left to the opcode table.
+        
+        Only addresses whose bytes all come from ROM are considered, since
+        those can never change and so never need invalidating. Call again
+        after loading ROMs or remapping I/O.
+        """
+        # CPU6502's handlers, like HANDLERS, whatever the instance's class
+        cls = CPU6502
+        read = memory.read
+        read_only = bytearray(memory.rom_mask)
+        for addr, entry in enumerate(memory.io_readers):
+            if entry is not None:
+                read_only[addr] = 0
+        
+        branches = {opcode: getattr(cls, f"{op}_resolved")
+                    for opcode, (op, _) in _BRANCH_CONDITIONS.items()}
+        decoded = {opcode: cls.DECODED_HANDLERS[handler.__name__]
+                   for opcode, handler in enumerate(cls.HANDLERS)
+                   if handler.__name__ in cls.DECODED_HANDLERS}
+        
+        self.fast_dispatch = fast_dispatch = [None] * 0x10000
+        for addr in range(0x10000 - 3):
+            if not (read_only[addr] and read_only[addr + 1]):
+                continue
+            
+            opcode = read(addr)
+            second = read(addr + 1)
+            if opcode in (0xE8, 0xCA) and second == 0xD0 and read_only[addr + 2]:
+                handler = cls.INX_BNE if opcode == 0xE8 else cls.DEX_BNE
+                entry = (handler, CYCLES[opcode] + CYCLES[0xD0],
+                         self._resolve_branch(memory, addr + 1))
+            elif opcode == 0x18 and second == 0x69 and read_only[addr + 2]:
+                entry = (cls.CLC_ADC_immediate, CYCLES[0x18] + CYCLES[0x69], read(addr + 2))
+            elif (opcode == 0xA9 and read_only[addr + 2] and read_only[addr + 3]
+                  and read(addr + 2) == 0x85):
+                entry = (cls.LDA_immediate_STA_zeropage, CYCLES[0xA9] + CYCLES[0x85],
+                         second | read(addr + 3) << 8)
+            elif opcode in branches:
+                entry = (branches[opcode], CYCLES[opcode], self._resolve_branch(memory, addr))
+            elif opcode in decoded:
+                handler, length = decoded[opcode]
+                if length == 2:
+                    if not read_only[addr + 2]:
+                        continue
+                    second |= read(addr + 2) << 8
+                entry = (handler, CYCLES[opcode], second)
+            else:
+                continue
+            fast_dispatch[addr] = entry
     
     def step(self, memory) -> int:
         """Execute one instruction and return cycles used."""
         # Check for interrupts
+        cycles = 0
         if self.nmi_pending:
-            self._handle_nmi(memory)
-        elif self.irq_pending and self.I == 0:
-            self._handle_irq(memory)
+            cycles = self._handle_nmi(memory)
+        elif self.irq_pending and not self.P & FLAG_I:
+            cycles = self._handle_irq(memory)
         
         # Fetch instruction
-        opcode = memory.read(self.PC)
-        self.PC += 1
+        pc = self.PC
+        opcode = memory.ram[pc]
+        self.PC = (pc + 1) & 0xFFFF
         
-        # Reset cycle counter for this instruction
-        self.cycles = 0
-        
-        # Execute instruction
-        if opcode in self.instructions:
-            self.instructions[opcode](memory)
-        else:
-            # Handle illegal opcodes as NOP
-            self.cycles += 2
+        # Execute instruction: base cycle count plus any penalty it returns
+        cycles += CYCLES[opcode] + self.HANDLERS[opcode](self, memory)
         
         # Update total cycles
-        self.total_cycles += self.cycles
+        self.total_cycles += cycles
+        
+        return cycles
+    
+    def execute(self, memory, cycles_target: int) -> int:
+        """Run instructions until at least cycles_target cycles have elapsed.
+        
+        Behaves like calling step() in a loop, but binds the dispatch table
+        and main memory to locals once for the whole run, and runs the
+        entries mapped by predecode() with their operands already decoded.
+        Superinstructions run as single dispatches (with no interrupt check
+        between the fused pair). Returns the number of cycles executed.
+        """
+        dispatch = self.HANDLERS
+        fast_dispatch = self.fast_dispatch
+        cycles_table = CYCLES
+        ram = memory.ram
+        executed = 0
+        
+        while executed < cycles_target:
+            # Check for interrupts
+            if self.nmi_pending:
+                executed += self._handle_nmi(memory)
+            elif self.irq_pending and not self.P & FLAG_I:
+                executed += self._handle_irq(memory)
+            
+            # Fetch and execute instruction
+            pc = self.PC
+            self.PC = (pc + 1) & 0xFFFF
+            decoded = fast_dispatch[pc]
+            if decoded is None:
+                opcode = ram[pc]
+                executed += cycles_table[opcode] + dispatch[opcode](self, memory)
+            else:
+                handler, cycles, operand = decoded
+                executed += cycles + handler(self, memory, operand)
+        
+        self.total_cycles += executed
+        return executed
+    
+    def step_many(self, memory, count: int) -> int:
+        """Execute exactly count instructions and return the cycles used.
+        
+        Equivalent to calling step() count times, with the dispatch table
+        and main memory bound to locals once. Unlike execute() it skips the
+        predecoded entries, so fused pairs still count as two instructions.
+        """
+        dispatch = self.HANDLERS
+        cycles_table = CYCLES
+        ram = memory.ram
+        executed = 0
+        
+        for _ in range(count):
+            # Check for interrupts
+            if self.nmi_pending:
+                executed += self._handle_nmi(memory)
+            elif self.irq_pending and not self.P & FLAG_I:
+                executed += self._handle_irq(memory)
+            
+            # Fetch and execute instruction
+            pc = self.PC
+            opcode = ram[pc]
+            self.PC = (pc + 1) & 0xFFFF
+            executed += cycles_table[opcode] + dispatch[opcode](self, memory)
         
-        return self.cycles
+        self.total_cycles += executed
+        return executed
     
-    def _handle_nmi(self, memory) -> None:
+    def _handle_nmi(self, memory) -> int:
         """Handle Non-Maskable Interrupt."""
         # Push PC to stack
-        memory.write(0x100 + self.SP, (self.PC >> 8) & 0xFF)
-        self.SP = (self.SP - 1) & 0xFF
-        memory.write(0x100 + self.SP, self.PC & 0xFF)
-        self.SP = (self.SP - 1) & 0xFF
+        ram = memory.ram
+        sp = self.SP
+        ram[0x100 | sp] = (self.PC >> 8) & 0xFF
+        ram[0x100 | ((sp - 1) & 0xFF)] = self.PC & 0xFF
         
         # Push status without B flag
-        memory.write(0x100 + self.SP, self.get_status() & ~0x10)
-        self.SP = (self.SP - 1) & 0xFF
+        ram[0x100 | ((sp - 2) & 0xFF)] = self.get_status() & ~FLAG_B
+        self.SP = (sp - 3) & 0xFF
         
         # Set I flag
-        self.I = 1
+        self.P |= FLAG_I
         
         # Load NMI vector
         self.PC = memory.read(0xFFFA) | (memory.read(0xFFFB) << 8)
-        self.cycles += 7
         
         # Clear NMI pending flag
         self.nmi_pending = False
+        return 7
     
-    def _handle_irq(self, memory) -> None:
+    def _handle_irq(self, memory) -> int:
         """Handle Interrupt Request."""
         # Push PC to stack
-        memory.write(0x100 + self.SP, (self.PC >> 8) & 0xFF)
-        self.SP = (self.SP - 1) & 0xFF
-        memory.write(0x100 + self.SP, self.PC & 0xFF)
-        self.SP = (self.SP - 1) & 0xFF
+        ram = memory.ram
+        sp = self.SP
+        ram[0x100 | sp] = (self.PC >> 8) & 0xFF
+        ram[0x100 | ((sp - 1) & 0xFF)] = self.PC & 0xFF
         
         # Push status without B flag
-        memory.write(0x100 + self.SP, self.get_status() & ~0x10)
-        self.SP = (self.SP - 1) & 0xFF
+        ram[0x100 | ((sp - 2) & 0xFF)] = self.get_status() & ~FLAG_B
+        self.SP = (sp - 3) & 0xFF
         
         # Set I flag
-        self.I = 1
+        self.P |= FLAG_I
         
         # Load IRQ vector
         self.PC = memory.read(0xFFFE) | (memory.read(0xFFFF) << 8)
-        self.cycles += 7
         
         # Clear IRQ pending flag
         self.irq_pending = False
+        return 7
     
     def trigger_nmi(self) -> None:
         """Trigger a Non-Maskable Interrupt."""
@@ -1514,91 +1225,133 @@ class CPU6502:
         }
 
 
+CPU6502._codegen_handlers()
+CPU6502._init_instruction_table()
+
+
 class Memory:
     """Emulates the memory subsystem with memory-mapped I/O."""
     
     def __init__(self, size: int = 0x10000):
-        # Main memory
+        # Main memory; ROMs are copied in, so reads never scan the ROM list
         self.ram = bytearray(size)
         
         # ROM areas
         self.roms = {}  # addr: (data, size)
+        self.rom_mask = bytearray(size)  # 1 where a ROM byte is mapped
+        
+        # Memory-mapped I/O handlers by address: (region start, handler), or
+        # None where nothing is mapped. Handlers get the offset from the
+        # start of their region.
+        self.io_readers = [None] * size
+        self.io_writers = [None] * size
         
-        # Memory-mapped I/O handlers
-        self.io_read_handlers = {}   # addr: handler_func
-        self.io_write_handlers = {}  # addr: handler_func
+        # Per-address kind for write(): 0 for RAM, 1 for ROM (write ignored)
+        # and 2 for an I/O write handler
+        self.write_map = bytearray(size)
+        
+        # 1 where both reads and writes go straight to ram (no ROM or I/O),
+        # so read-modify-write instructions can skip read() and write()
+        self.direct_map = bytearray(b'\x01') * size
     
     def load_rom(self, data: bytes, addr: int) -> None:
         """Load ROM data at the specified address."""
         size = len(data)
         self.roms[addr] = (bytes(data), size)
         
-        # Copy to main memory for initial state
+        # Copy to main memory; a ROM loaded earlier keeps any overlap
         for i, b in enumerate(data):
-            if addr + i < len(self.ram):
-                self.ram[addr + i] = b
+            rom_addr = addr + i
+            if rom_addr >= len(self.ram):
+                break
+            if not self.rom_mask[rom_addr]:
+                self.rom_mask[rom_addr] = 1
+                self.direct_map[rom_addr] = 0
+                self.ram[rom_addr] = b
+                if not self.write_map[rom_addr]:
+                    self.write_map[rom_addr] = 1
+    
+    def register_io_range(self, start: int, end: int, read_handler=None, write_handler=None) -> None:
+        """Register I/O handlers for the addresses start..end-1.
+        
+        read_handler(offset) and write_handler(offset, value) are called with
+        the offset of the accessed address from start.
+        """
+        read_entry = (start, read_handler)
+        write_entry = (start, write_handler)
+        for addr in range(start, end):
+            if read_handler:
+                self.io_readers[addr] = read_entry
+                self.direct_map[addr] = 0
+            if write_handler:
+                self.io_writers[addr] = write_entry
+                self.write_map[addr] = 2
+                self.direct_map[addr] = 0
     
     def register_io_handler(self, addr: int, read_handler=None, write_handler=None) -> None:
-        """Register I/O handlers for a memory-mapped address."""
-        if read_handler:
-            self.io_read_handlers[addr] = read_handler
-        if write_handler:
-            self.io_write_handlers[addr] = write_handler
+        """Register I/O handlers for a single memory-mapped address."""
+        addr &= 0xFFFF
+        self.register_io_range(
+            addr, addr + 1,
+            read_handler=read_handler and (lambda offset: read_handler()),
+            write_handler=write_handler and (lambda offset, value: write_handler(value))
+        )
     
     def read(self, addr: int) -> int:
-        """Read a byte from memory, handling ROMs and I/O."""
-        addr = addr & 0xFFFF  # Ensure address is 16-bit
+        """Read a byte from memory, handling ROMs and I/O.
         
+        addr must already be in 0..0xFFFF; the CPU masks every address it
+        computes, so read() does not mask again.
+        """
         # Check for I/O handler
-        if addr in self.io_read_handlers:
-            return self.io_read_handlers[addr]()
+        entry = self.io_readers[addr]
+        if entry is not None:
+            start, handler = entry
+            return handler(addr - start)
         
-        # Check if in ROM area
-        for rom_addr, (data, size) in self.roms.items():
-            if rom_addr <= addr < rom_addr + size:
-                offset = addr - rom_addr
-                return data[offset]
-        
-        # Regular RAM access
+        # RAM, or ROM copied into it
         return self.ram[addr]
     
     def write(self, addr: int, value: int) -> None:
-        """Write a byte to memory, handling ROMs and I/O."""
-        addr = addr & 0xFFFF  # Ensure address is 16-bit
-        value = value & 0xFF  # Ensure value is 8-bit
-        
-        # Check for I/O handler
-        if addr in self.io_write_handlers:
-            self.io_write_handlers[addr](value)
-            return
-        
-        # Check if in ROM area (can't write to ROM)
-        for rom_addr, (_, size) in self.roms.items():
-            if rom_addr <= addr < rom_addr + size:
-                return
-        
-        # Regular RAM access
-        self.ram[addr] = value
+        """Write a byte to memory, handling ROMs and I/O.
+        
+        Like read(), expects addr in 0..0xFFFF and value in 0..0xFF.
+        """
+        kind = self.write_map[addr]
+        if not kind:
+            # Regular RAM access
+            self.ram[addr] = value
+        elif kind == 2:
+            # I/O handler
+            start, handler = self.io_writers[addr]
+            handler(addr - start, value)
+        # Otherwise ROM: can't write to ROM
     
     def read_word(self, addr: int) -> int:
         """Read a 16-bit word from memory (little-endian)."""
-        return self.read(addr) | (self.read(addr + 1) << 8)
+        return self.read(addr & 0xFFFF) | (self.read((addr + 1) & 0xFFFF) << 8)
     
     def write_word(self, addr: int, value: int) -> None:
         """Write a 16-bit word to memory (little-endian)."""
-        self.write(addr, value & 0xFF)
-        self.write(addr + 1, (value >> 8) & 0xFF)
+        self.write(addr & 0xFFFF, value & 0xFF)
+        self.write((addr + 1) & 0xFFFF, (value >> 8) & 0xFF)
 
 
 class VideoRAM:
     """Emulates the PET's screen memory."""
     
-    def __init__(self, width: int = 40, height: int = 25):
+    def __init__(self, width: int = 40, height: int = 25, buffer=None):
         self.width = width
         self.height = height
         self.size = width * height
-        self.memory = bytearray(self.size)
-        self.dirty = True  # Flag to indicate screen needs redrawing
+        
+        # Screen memory; pass a writable buffer (such as a memoryview into
+        # main memory) to share storage with it instead of keeping a copy
+        self.memory = bytearray(self.size) if buffer is None else buffer
+        
+        # Rows needing a redraw, bit n for row n; all dirty to start with
+        self.all_rows = (1 << height) - 1
+        self.dirty_rows = self.all_rows
     
     def read(self, addr: int) -> int:
         """Read from video RAM."""
@@ -1607,25 +1360,26 @@ class VideoRAM:
         return 0
     
     def write(self, addr: int, value: int) -> None:
-        """Write to video RAM and mark as dirty."""
+        """Write to video RAM and mark the row as dirty."""
         if 0 <= addr < self.size:
             if self.memory[addr] != value:
                 self.memory[addr] = value
-                self.dirty = True
+                self.dirty_rows |= 1 << (addr // self.width)
     
     def clear(self) -> None:
         """Clear the screen with spaces."""
-        for i in range(self.size):
-            self.memory[i] = 0x20  # ASCII space
-        self.dirty = True
+        self.memory[:] = b'\x20' * self.size  # ASCII space
+        self.dirty_rows = self.all_rows
 
 
 class PETKeyboard:
     """Emulates the PET keyboard matrix."""
     
     def __init__(self):
-        # PET keyboard matrix (8x8)
-        self.matrix = [0xFF] * 10  # 10 rows, all keys up (1=up, 0=down)
+        # PET keyboard matrix: 10 rows of 8 keys packed into one int, row r
+        # in bits 8r..8r+7. All keys up to start with (1=up, 0=down).
+        self.num_rows = 10
+        self.matrix_bits = (1 << (8 * self.num_rows)) - 1
         self.last_key = None
         
         # Key mapping: maps ASCII/curses keys to (row, col) in matrix
@@ -1738,15 +1492,16 @@ class PETKeyboard:
             return
         
         # Update matrix (1=up, 0=down)
+        bit = 1 << (row * 8 + col)
         if is_down:
-            self.matrix[row] &= ~(1 << col)
+            self.matrix_bits &= ~bit
         else:
-            self.matrix[row] |= (1 << col)
+            self.matrix_bits |= bit
     
     def read_row(self, row: int) -> int:
         """Read a row from the keyboard matrix."""
-        if 0 <= row < len(self.matrix):
-            return self.matrix[row]
+        if 0 <= row < self.num_rows:
+            return (self.matrix_bits >> (row * 8)) & 0xFF
         return 0xFF  # All keys up
 
 
@@ -1765,6 +1520,14 @@ class PETScreen:
         
         # PET character set mapping (PETSCII to ASCII/displayable)
         self.charset = self._create_charset()
+        
+        # The same mapping as a 256-character table for str.translate(), so
+        # whole spans convert in one call
+        self.translation = "".join([self.charset[code] for code in range(256)])
+        
+        # Character codes currently on screen, laid out like video RAM; None
+        # until the first update
+        self._shadow = None
     
     def _create_charset(self) -> Dict[int, str]:
         """Create a mapping from PETSCII codes to displayable characters."""
@@ -1791,47 +1554,101 @@ class PETScreen:
         return charset
     
     def update(self, video_ram: VideoRAM) -> None:
-        """Update the screen from video RAM if dirty."""
-        if not video_ram.dirty:
+        """Redraw the cells of video RAM that changed since the last update."""
+        dirty_rows = video_ram.dirty_rows
+        if not dirty_rows:
             return
         
-        for y in range(min(self.height, video_ram.height)):
-            for x in range(min(self.width, video_ram.width)):
-                char_code = video_ram.memory[y * video_ram.width + x]
-                char = self.charset.get(char_code, '?')
-                
-                try:
-                    self.stdscr.addch(y, x, char, self.color)
-                except curses.error:
-                    pass  # Ignore errors from writing to bottom-right corner
+        # Take the dirty set before drawing, so writes made meanwhile are
+        # picked up by the next update
+        video_ram.dirty_rows = 0
+        
+        memory = video_ram.memory
+        shadow = self._shadow
+        if shadow is None:
+            # Nothing drawn yet: start from a copy that differs everywhere
+            shadow = self._shadow = bytearray(code ^ 0xFF for code in memory)
+        
+        translation = self.translation
+        
+        # Clip to the window, leaving out its bottom-right cell: curses
+        # raises an error after writing there, as the cursor cannot advance
+        max_y, max_x = self.stdscr.getmaxyx()
+        full_width = min(self.width, video_ram.width, max_x)
+        
+        # Only visit rows between the lowest and highest dirty row
+        first_row = (dirty_rows & -dirty_rows).bit_length() - 1
+        end_row = min(self.height, video_ram.height, max_y, dirty_rows.bit_length())
+        for y in range(first_row, end_row):
+            if not (dirty_rows >> y) & 1:
+                continue
+            
+            width = full_width if y < max_y - 1 else min(full_width, max_x - 1)
+            start = y * video_ram.width
+            row = memory[start:start + width]
+            drawn = shadow[start:start + width]
+            if row == drawn:
+                continue
+            
+            # Redraw the span between the first and last changed cells
+            first = 0
+            while row[first] == drawn[first]:
+                first += 1
+            last = width - 1
+            while row[last] == drawn[last]:
+                last -= 1
+            span = row[first:last + 1]
+            shadow[start + first:start + last + 1] = span
+            
+            text = str(span, 'latin-1').translate(translation)
+            self.stdscr.addstr(y, first, text, self.color)
         
         self.stdscr.refresh()
-        video_ram.dirty = False
+
+
+# VIA register numbers whose state lives directly in VIA.registers
+VIA_PORT_B = 0x0
+VIA_PORT_A = 0x1
+VIA_DDR_B = 0x2
+VIA_DDR_A = 0x3
+VIA_SHIFT = 0xA
+VIA_ACR = 0xB
+VIA_PCR = 0xC
+VIA_PORT_A_NH = 0xF
+
+
+def _via_register(index: int, doc: str) -> property:
+    """Expose one byte of VIA.registers as an attribute."""
+    def getter(self) -> int:
+        return self.registers[index]
+    
+    def setter(self, value: int) -> None:
+        self.registers[index] = value
+    
+    return property(getter, setter, doc=doc)
 
 
 class VIA:
     """Emulates the 6522 Versatile Interface Adapter."""
     
+    port_b = _via_register(VIA_PORT_B, "Port B output")
+    port_a = _via_register(VIA_PORT_A, "Port A output")
+    ddr_b = _via_register(VIA_DDR_B, "Port B direction (1=output, 0=input)")
+    ddr_a = _via_register(VIA_DDR_A, "Port A direction (1=output, 0=input)")
+    shift_register = _via_register(VIA_SHIFT, "Shift register")
+    
     def __init__(self):
-        # Registers
+        # Registers. The ports, data direction registers and shift register
+        # are kept here and nowhere else; the properties above name them.
         self.registers = bytearray(16)
-        
-        # I/O ports
-        self.port_a = 0xFF  # Port A output
-        self.port_b = 0xFF  # Port B output
-        
-        # Data direction registers (1=output, 0=input)
-        self.ddr_a = 0x00  # Port A direction
-        self.ddr_b = 0x00  # Port B direction
+        self.registers[VIA_PORT_B] = 0xFF
+        self.registers[VIA_PORT_A] = 0xFF
         
         # Timers
         self.timer1_counter = 0
         self.timer1_latch = 0
         self.timer2_counter = 0
         
-        # Shift register
-        self.shift_register = 0
-        
         # IRQ status and control
         self.irq_status = 0
         self.irq_enable = 0
@@ -1841,6 +1658,45 @@ class VIA:
         self.read_port_b = None
         self.write_port_a = None
         self.write_port_b = None
+        
+        # Register access dispatch tables, indexed by register number.
+        # Registers without special behaviour read back the register array.
+        self._readers = [
+            self._read_port_b,                      # 0x0 Port B
+            self._read_port_a,                      # 0x1 Port A
+            lambda: self.registers[VIA_DDR_B],      # 0x2 DDR B
+            lambda: self.registers[VIA_DDR_A],      # 0x3 DDR A
+            self._read_timer1_low,                  # 0x4 Timer 1 counter low
+            self._read_timer1_high,                 # 0x5 Timer 1 counter high
+            self._read_timer1_latch_low,            # 0x6 Timer 1 latch low
+            self._read_timer1_latch_high,           # 0x7 Timer 1 latch high
+            self._read_timer2_low,                  # 0x8 Timer 2 counter low
+            self._read_timer2_high,                 # 0x9 Timer 2 counter high
+            lambda: self.registers[VIA_SHIFT],      # 0xA Shift register
+            lambda: self.registers[VIA_ACR],        # 0xB Auxiliary control register
+            lambda: self.registers[VIA_PCR],        # 0xC Peripheral control register
+            self._read_irq_status,                  # 0xD Interrupt flag register
+            self._read_irq_enable,                  # 0xE Interrupt enable register
+            lambda: self.registers[VIA_PORT_A_NH],  # 0xF Port A (no handshake)
+        ]
+        self._writers = [
+            self._write_port_b,                     # 0x0 Port B
+            self._write_port_a,                     # 0x1 Port A
+            self._write_register,                   # 0x2 DDR B
+            self._write_register,                   # 0x3 DDR A
+            self._write_timer1_latch_low,           # 0x4 Timer 1 counter low
+            self._write_timer1_high,                # 0x5 Timer 1 counter high
+            self._write_timer1_latch_low,           # 0x6 Timer 1 latch low
+            self._write_timer1_latch_high,          # 0x7 Timer 1 latch high
+            self._write_timer2_low,                 # 0x8 Timer 2 counter low
+            self._write_timer2_high,                # 0x9 Timer 2 counter high
+            self._write_register,                   # 0xA Shift register
+            self._write_register,                   # 0xB Auxiliary control register
+            self._write_register,                   # 0xC Peripheral control register
+            self._write_irq_status,                 # 0xD Interrupt flag register
+            self._write_irq_enable,                 # 0xE Interrupt enable register
+            self._write_register,                   # 0xF Port A (no handshake)
+        ]
     
     def set_port_a_handlers(self, read_func=None, write_func=None) -> None:
         """Set handlers for Port A operations."""
@@ -1854,155 +1710,321 @@ class VIA:
     
     def read(self, addr: int) -> int:
         """Read from a VIA register."""
-        reg = addr & 0x0F
-        
-        if reg == 0x0:  # Port B
-            if self.read_port_b:
-                input_value = self.read_port_b()
-            else:
-                input_value = 0xFF
-            
-            # Apply data direction register
-            return (self.port_b & self.ddr_b) | (input_value & ~self.ddr_b)
-        
-        elif reg == 0x1:  # Port A
-            if self.read_port_a:
-                input_value = self.read_port_a()
-            else:
-                input_value = 0xFF
-            
-            # Apply data direction register
-            return (self.port_a & self.ddr_a) | (input_value & ~self.ddr_a)
-        
-        elif reg == 0x2:  # DDR B
-            return self.ddr_b
-        
-        elif reg == 0x3:  # DDR A
-            return self.ddr_a
-        
-        elif reg == 0x4:  # Timer 1 counter low
-            return self.timer1_counter & 0xFF
-        
-        elif reg == 0x5:  # Timer 1 counter high
-            return (self.timer1_counter >> 8) & 0xFF
-        
-        elif reg == 0x6:  # Timer 1 latch low
-            return self.timer1_latch & 0xFF
-        
-        elif reg == 0x7:  # Timer 1 latch high
-            return (self.timer1_latch >> 8) & 0xFF
-        
-        elif reg == 0x8:  # Timer 2 counter low
-            return self.timer2_counter & 0xFF
-        
-        elif reg == 0x9:  # Timer 2 counter high
-            return (self.timer2_counter >> 8) & 0xFF
-        
-        elif reg == 0xA:  # Shift register
-            return self.shift_register
-        
-        elif reg == 0xD:  # Interrupt flag register
-            return self.irq_status
-        
-        elif reg == 0xE:  # Interrupt enable register
-            return self.irq_enable
-        
-        # Other registers
-        return self.registers[reg]
+        return self._readers[addr & 0x0F]()
     
     def write(self, addr: int, value: int) -> None:
         """Write to a VIA register."""
         reg = addr & 0x0F
         value &= 0xFF
         
-        if reg == 0x0:  # Port B
-            self.port_b = value
-            if self.write_port_b:
-                # Only output pins controlled by DDR
-                output_value = value & self.ddr_b
-                self.write_port_b(output_value)
-        
-        elif reg == 0x1:  # Port A
-            self.port_a = value
-            if self.write_port_a:
-                # Only output pins controlled by DDR
-                output_value = value & self.ddr_a
-                self.write_port_a(output_value)
-        
-        elif reg == 0x2:  # DDR B
-            self.ddr_b = value
-        
-        elif reg == 0x3:  # DDR A
-            self.ddr_a = value
-        
-        elif reg == 0x4:  # Timer 1 counter low
-            self.timer1_latch = (self.timer1_latch & 0xFF00) | value
-        
-        elif reg == 0x5:  # Timer 1 counter high
-            self.timer1_latch = (value << 8) | (self.timer1_latch & 0xFF)
-            self.timer1_counter = self.timer1_latch
-            self.irq_status &= ~0x40  # Clear Timer 1 interrupt
-        
-        elif reg == 0x6:  # Timer 1 latch low
-            self.timer1_latch = (self.timer1_latch & 0xFF00) | value
-        
-        elif reg == 0x7:  # Timer 1 latch high
-            self.timer1_latch = (value << 8) | (self.timer1_latch & 0xFF)
-        
-        elif reg == 0x8:  # Timer 2 counter low
-            self.timer2_counter = (self.timer2_counter & 0xFF00) | value
-        
-        elif reg == 0x9:  # Timer 2 counter high
-            self.timer2_counter = (value << 8) | (self.timer2_counter & 0xFF)
-            self.irq_status &= ~0x20  # Clear Timer 2 interrupt
-        
-        elif reg == 0xA:  # Shift register
-            self.shift_register = value
-        
-        elif reg == 0xD:  # Interrupt flag register
-            # Writing 1 clears the corresponding bit
-            self.irq_status &= ~value
+        # Every write lands in the register array, then gets its side effects
+        self.registers[reg] = value
+        self._writers[reg](value)
+    
+    # Register read handlers, indexed by register number in _readers
+    def _read_port_b(self) -> int:
+        if self.read_port_b:
+            input_value = self.read_port_b()
+        else:
+            input_value = 0xFF
         
-        elif reg == 0xE:  # Interrupt enable register
-            if value & 0x80:
-                # Set bits where bits in value are 1
-                self.irq_enable |= (value & 0x7F)
-            else:
-                # Clear bits where bits in value are 1
-                self.irq_enable &= ~(value & 0x7F)
+        # Apply data direction register
+        registers = self.registers
+        ddr = registers[VIA_DDR_B]
+        return (registers[VIA_PORT_B] & ddr) | (input_value & ~ddr)
+    
+    def _read_port_a(self) -> int:
+        if self.read_port_a:
+            input_value = self.read_port_a()
+        else:
+            input_value = 0xFF
         
-        # Store in register array anyway
-        self.registers[reg] = value
+        # Apply data direction register
+        registers = self.registers
+        ddr = registers[VIA_DDR_A]
+        return (registers[VIA_PORT_A] & ddr) | (input_value & ~ddr)
+    
+    def _read_timer1_low(self) -> int:
+        return self.timer1_counter & 0xFF
+    
+    def _read_timer1_high(self) -> int:
+        return (self.timer1_counter >> 8) & 0xFF
+    
+    def _read_timer1_latch_low(self) -> int:
+        return self.timer1_latch & 0xFF
+    
+    def _read_timer1_latch_high(self) -> int:
+        return (self.timer1_latch >> 8) & 0xFF
+    
+    def _read_timer2_low(self) -> int:
+        return self.timer2_counter & 0xFF
+    
+    def _read_timer2_high(self) -> int:
+        return (self.timer2_counter >> 8) & 0xFF
+    
+    def _read_irq_status(self) -> int:
+        return self.irq_status
+    
+    def _read_irq_enable(self) -> int:
+        return self.irq_enable
+    
+    # Register write handlers, indexed by register number in _writers
+    def _write_port_b(self, value: int) -> None:
+        if self.write_port_b:
+            # Only output pins controlled by DDR
+            output_value = value & self.registers[VIA_DDR_B]
+            self.write_port_b(output_value)
+    
+    def _write_port_a(self, value: int) -> None:
+        if self.write_port_a:
+            # Only output pins controlled by DDR
+            output_value = value & self.registers[VIA_DDR_A]
+            self.write_port_a(output_value)
+    
+    def _write_timer1_latch_low(self, value: int) -> None:
+        # Also used for the timer 1 counter low register
+        self.timer1_latch = (self.timer1_latch & 0xFF00) | value
+    
+    def _write_timer1_high(self, value: int) -> None:
+        self.timer1_latch = (value << 8) | (self.timer1_latch & 0xFF)
+        self.timer1_counter = self.timer1_latch
+        self.irq_status &= ~0x40  # Clear Timer 1 interrupt
+    
+    def _write_timer1_latch_high(self, value: int) -> None:
+        self.timer1_latch = (value << 8) | (self.timer1_latch & 0xFF)
+    
+    def _write_timer2_low(self, value: int) -> None:
+        self.timer2_counter = (self.timer2_counter & 0xFF00) | value
+    
+    def _write_timer2_high(self, value: int) -> None:
+        self.timer2_counter = (value << 8) | (self.timer2_counter & 0xFF)
+        self.irq_status &= ~0x20  # Clear Timer 2 interrupt
+    
+    def _write_irq_status(self, value: int) -> None:
+        # Writing 1 clears the corresponding bit
+        self.irq_status &= ~value
+    
+    def _write_irq_enable(self, value: int) -> None:
+        # Bit 7 set: set the bits given in bits 0-6, else clear them.
+        # -(value >> 7) is all ones or zero, selecting which mask applies.
+        bits = value & 0x7F
+        select = -(value >> 7)
+        self.irq_enable = (self.irq_enable | (select & bits)) & ~(~select & bits)
+    
+    def _write_register(self, value: int) -> None:
+        # Registers with no side effects only keep the value in the array
+        pass
     
     def update_timers(self, cycles: int) -> bool:
-        """Update timers and return True if an IRQ was triggered."""
+        """Advance the timers by cycles and return True if an IRQ was triggered.
+        
+        cycles may span several timer periods: timer 1 reloads from its
+        latch each time it expires, carrying the excess into the next period.
+        """
+        counter1 = self.timer1_counter
+        counter2 = self.timer2_counter
+        if not (counter1 | counter2):
+            # Neither timer is running
+            return False
+        
         irq_triggered = False
         
         # Timer 1
-        if self.timer1_counter > 0:
-            if self.timer1_counter <= cycles:
-                # Timer expired
-                self.timer1_counter = self.timer1_latch  # Reload
+        if counter1 > 0:
+            if counter1 <= cycles:
+                # Timer expired, possibly more than once
+                latch = self.timer1_latch
+                self.timer1_counter = latch - (cycles - counter1) % latch if latch else 0
                 self.irq_status |= 0x40  # Set Timer 1 interrupt flag
                 if self.irq_enable & 0x40:
                     irq_triggered = True
             else:
-                self.timer1_counter -= cycles
+                self.timer1_counter = counter1 - cycles
         
         # Timer 2
-        if self.timer2_counter > 0:
-            if self.timer2_counter <= cycles:
+        if counter2 > 0:
+            if counter2 <= cycles:
                 # Timer expired
                 self.timer2_counter = 0
                 self.irq_status |= 0x20  # Set Timer 2 interrupt flag
                 if self.irq_enable & 0x20:
                     irq_triggered = True
             else:
-                self.timer2_counter -= cycles
+                self.timer2_counter = counter2 - cycles
         
         return irq_triggered
 
 
+# Minimal BASIC ROM program, run from $C000 on reset
+_BASIC_STUB = bytes((
+    # Reset vector points to start of ROM
+    0xA9, 0x93,       # LDA #$93 (Clear screen code)
+    0x20, 0xD2, 0xFF, # JSR $FFD2 (KERNAL output character)
+    0xA9, 0x0D,       # LDA #$0D (Return character)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x50,       # LDA #$50 ('P')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x45,       # LDA #$45 ('E')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x54,       # LDA #$54 ('T')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x20,       # LDA #$20 (Space)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x42,       # LDA #$42 ('B')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x41,       # LDA #$41 ('A')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x53,       # LDA #$53 ('S')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x49,       # LDA #$49 ('I')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x43,       # LDA #$43 ('C')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x0D,       # LDA #$0D (Return)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x52,       # LDA #$52 ('R')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x45,       # LDA #$45 ('E')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x41,       # LDA #$41 ('A')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x44,       # LDA #$44 ('D')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x59,       # LDA #$59 ('Y')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x0D,       # LDA #$0D (Return)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA2, 0x00,       # LDX #$00 (Input buffer index)
+    0xA9, 0x3E,       # LDA #$3E ('>')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x20,       # LDA #$20 (Space)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    # Input loop
+    0x20, 0xE4, 0xFF, # JSR $FFE4 (KERNAL get character)
+    0xF0, 0xFB,       # BEQ -5 (Loop until key pressed)
+    0xC9, 0x0D,       # CMP #$0D (Check for return)
+    0xF0, 0x0A,       # BEQ +10 (Process command if return)
+    0x9D, 0x00, 0x02, # STA $0200,X (Store in input buffer)
+    0x20, 0xD2, 0xFF, # JSR $FFD2 (Echo character)
+    0xE8,             # INX
+    0xE0, 0x3F,       # CPX #$3F (Check if buffer full)
+    0xD0, 0xEE,       # BNE -18 (Continue input if not full)
+    # Process command
+    0xA9, 0x0D,       # LDA #$0D (Return)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xAD, 0x00, 0x02, # LDA $0200 (Check first character)
+    0xC9, 0x50,       # CMP #$50 ('P')
+    0xF0, 0x19,       # BEQ +25 (PRINT command)
+    0xC9, 0x52,       # CMP #$52 ('R')
+    0xF0, 0x2A,       # BEQ +42 (RUN command)
+    0xC9, 0x4C,       # CMP #$4C ('L')
+    0xF0, 0x36,       # BEQ +54 (LIST command)
+    0xC9, 0x4E,       # CMP #$4E ('N')
+    0xF0, 0x3D,       # BEQ +61 (NEW command)
+    # Unknown command
+    0xA9, 0x3F,       # LDA #$3F ('?')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x0D,       # LDA #$0D (Return)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
+    # PRINT command
+    0xA2, 0x05,       # LDX #$05 (Skip "PRINT" in buffer)
+    # Print loop
+    0xBD, 0x00, 0x02, # LDA $0200,X (Get char from buffer)
+    0xF0, 0x07,       # BEQ +7 (End if zero)
+    0xE8,             # INX
+    0x20, 0xD2, 0xFF, # JSR $FFD2 (Print character)
+    0xE0, 0x3F,       # CPX #$3F (Check buffer end)
+    0xD0, 0xF4,       # BNE -12 (Continue if not at end)
+    0xA9, 0x0D,       # LDA #$0D (Return)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
+    # RUN command
+    0xA9, 0x52,       # LDA #$52 ('R')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x55,       # LDA #$55 ('U')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x4E,       # LDA #$4E ('N')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x0D,       # LDA #$0D (Return)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
+    # LIST command
+    0xA9, 0x4E,       # LDA #$4E ('N')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x4F,       # LDA #$4F ('O')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x20,       # LDA #$20 (Space)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x50,       # LDA #$50 ('P')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x52,       # LDA #$52 ('R')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x4F,       # LDA #$4F ('O')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x47,       # LDA #$47 ('G')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x0D,       # LDA #$0D (Return)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
+    # NEW command
+    0xA9, 0x4D,       # LDA #$4D ('M')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x45,       # LDA #$45 ('E')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x4D,       # LDA #$4D ('M')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x4F,       # LDA #$4F ('O')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x52,       # LDA #$52 ('R')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x59,       # LDA #$59 ('Y')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x20,       # LDA #$20 (Space)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x43,       # LDA #$43 ('C')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x4C,       # LDA #$4C ('L')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x45,       # LDA #$45 ('E')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x41,       # LDA #$41 ('A')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x52,       # LDA #$52 ('R')
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0xA9, 0x0D,       # LDA #$0D (Return)
+    0x20, 0xD2, 0xFF, # JSR $FFD2
+    0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
+))
+
+# KERNAL CHROUT routine: output a character ($FFD2)
+_CHROUT_STUB = bytes((
+    0x48,             # PHA (Save A)
+    0x86, 0xFB,       # STX $FB (Save X)
+    0x84, 0xFC,       # STY $FC (Save Y)
+    0xAA,             # TAX (Character to X)
+    0xBD, 0x00, 0xE0, # LDA $E000,X (Look up in character ROM)
+    0x8D, 0x00, 0x80, # STA $8000 (Store to screen)
+    0xEE, 0x37, 0x03, # INC $0337 (Increment cursor position)
+    0xA6, 0xFB,       # LDX $FB (Restore X)
+    0xA4, 0xFC,       # LDY $FC (Restore Y)
+    0x68,             # PLA (Restore A)
+    0x60,             # RTS
+))
+
+# KERNAL GETIN routine: get a character from the keyboard ($FFE4)
+_GETIN_STUB = bytes((
+    0xAD, 0x10, 0xE8, # LDA $E810 (Read keyboard row)
+    0xC9, 0xFF,       # CMP #$FF (Check if any key pressed)
+    0xF0, 0x05,       # BEQ +5 (Return 0 if no key)
+    0xAD, 0x11, 0xE8, # LDA $E811 (Get key code)
+    0xEE, 0x12, 0xE8, # INC $E812 (Acknowledge key)
+    0x60,             # RTS
+    0xA9, 0x00,       # LDA #$00 (No key pressed)
+    0x60,             # RTS
+))
+
+
 class PET:
     """Main PET computer system."""
     
@@ -2010,7 +2032,7 @@ class PET:
         # Core components
         self.cpu = CPU6502()
         self.memory = Memory()
-        self.video_ram = VideoRAM(40, 25)
+        self.video_ram = VideoRAM(40, 25, memoryview(self.memory.ram)[0x8000:0x8000 + 1000])
         self.screen = PETScreen(stdscr, 40, 25)
         self.keyboard = PETKeyboard()
         
@@ -2022,6 +2044,11 @@ class PET:
         self.running = False
         self.debug_mode = False
         self.cycles_per_frame = 20000  # Roughly 50Hz refresh at 1MHz
+        self.cycles_per_timer_update = 500  # VIA timers advance in these steps
+        
+        # Key codes handled by process_key() itself
+        self._key_esc = 27
+        self._key_f12 = curses.KEY_F12
         
         # Set up the memory map
         self._setup_memory_map()
@@ -2031,225 +2058,54 @@ class PET:
         
         # Connect peripherals
         self._connect_peripherals()
+        
+        # Predecode branches and common instruction pairs in the ROMs
+        self.cpu.predecode(self.memory)
     
     def _setup_memory_map(self):
         """Set up the memory map for the PET."""
-        # Video RAM at 0x8000-0x83E7 (40x25 = 1000 bytes)
-        for i in range(0x8000, 0x8000 + 1000):
-            self.memory.register_io_handler(
-                i,
-                read_handler=lambda addr=i: self.video_ram.read(addr - 0x8000),
-                write_handler=lambda value, addr=i: self.video_ram.write(addr - 0x8000, value)
-            )
+        # Video RAM at 0x8000-0x83E7 (40x25 = 1000 bytes). It shares main
+        # memory, so reads need no handler; writes go through VideoRAM to
+        # mark rows dirty.
+        self.memory.register_io_range(0x8000, 0x8000 + 1000,
+                                      write_handler=self.video_ram.write)
         
         # VIA 1 at 0xE810-0xE81F
-        for i in range(0xE810, 0xE820):
-            self.memory.register_io_handler(
-                i,
-                read_handler=lambda addr=i: self.via1.read(addr - 0xE810),
-                write_handler=lambda value, addr=i: self.via1.write(addr - 0xE810, value)
-            )
+        self.memory.register_io_range(0xE810, 0xE820, self.via1.read, self.via1.write)
         
         # VIA 2 at 0xE820-0xE82F
-        for i in range(0xE820, 0xE830):
-            self.memory.register_io_handler(
-                i,
-                read_handler=lambda addr=i: self.via2.read(addr - 0xE820),
-                write_handler=lambda value, addr=i: self.via2.write(addr - 0xE820, value)
-            )
+        self.memory.register_io_range(0xE820, 0xE830, self.via2.read, self.via2.write)
     
     def _load_roms(self, model):
         """Load ROMs for the specified PET model."""
         # For simplicity, instead of loading actual ROM files,
         # we'll create a minimal BASIC ROM that can execute a simple program
         
-        # Generate a simple ROM with BASIC interpreter stubs
-        basic_rom = bytearray([
-            # Reset vector points to start of ROM
-            0xA9, 0x93,       # LDA #$93 (Clear screen code)
-            0x20, 0xD2, 0xFF, # JSR $FFD2 (KERNAL output character)
-            0xA9, 0x0D,       # LDA #$0D (Return character)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x50,       # LDA #$50 ('P')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x45,       # LDA #$45 ('E')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x54,       # LDA #$54 ('T')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x20,       # LDA #$20 (Space)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x42,       # LDA #$42 ('B')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x41,       # LDA #$41 ('A')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x53,       # LDA #$53 ('S')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x49,       # LDA #$49 ('I')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x43,       # LDA #$43 ('C')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x0D,       # LDA #$0D (Return)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x52,       # LDA #$52 ('R')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x45,       # LDA #$45 ('E')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x41,       # LDA #$41 ('A')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x44,       # LDA #$44 ('D')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x59,       # LDA #$59 ('Y')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x0D,       # LDA #$0D (Return)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA2, 0x00,       # LDX #$00 (Input buffer index)
-            0xA9, 0x3E,       # LDA #$3E ('>')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x20,       # LDA #$20 (Space)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            # Input loop
-            0x20, 0xE4, 0xFF, # JSR $FFE4 (KERNAL get character)
-            0xF0, 0xFB,       # BEQ -5 (Loop until key pressed)
-            0xC9, 0x0D,       # CMP #$0D (Check for return)
-            0xF0, 0x0A,       # BEQ +10 (Process command if return)
-            0x9D, 0x00, 0x02, # STA $0200,X (Store in input buffer)
-            0x20, 0xD2, 0xFF, # JSR $FFD2 (Echo character)
-            0xE8,             # INX
-            0xE0, 0x3F,       # CPX #$3F (Check if buffer full)
-            0xD0, 0xEE,       # BNE -18 (Continue input if not full)
-            # Process command
-            0xA9, 0x0D,       # LDA #$0D (Return)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xAD, 0x00, 0x02, # LDA $0200 (Check first character)
-            0xC9, 0x50,       # CMP #$50 ('P')
-            0xF0, 0x19,       # BEQ +25 (PRINT command)
-            0xC9, 0x52,       # CMP #$52 ('R')
-            0xF0, 0x2A,       # BEQ +42 (RUN command)
-            0xC9, 0x4C,       # CMP #$4C ('L')
-            0xF0, 0x36,       # BEQ +54 (LIST command)
-            0xC9, 0x4E,       # CMP #$4E ('N')
-            0xF0, 0x3D,       # BEQ +61 (NEW command)
-            # Unknown command
-            0xA9, 0x3F,       # LDA #$3F ('?')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x0D,       # LDA #$0D (Return)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
-            # PRINT command
-            0xA2, 0x05,       # LDX #$05 (Skip "PRINT" in buffer)
-            # Print loop
-            0xBD, 0x00, 0x02, # LDA $0200,X (Get char from buffer)
-            0xF0, 0x07,       # BEQ +7 (End if zero)
-            0xE8,             # INX
-            0x20, 0xD2, 0xFF, # JSR $FFD2 (Print character)
-            0xE0, 0x3F,       # CPX #$3F (Check buffer end)
-            0xD0, 0xF4,       # BNE -12 (Continue if not at end)
-            0xA9, 0x0D,       # LDA #$0D (Return)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
-            # RUN command
-            0xA9, 0x52,       # LDA #$52 ('R')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x55,       # LDA #$55 ('U')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x4E,       # LDA #$4E ('N')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x0D,       # LDA #$0D (Return)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
-            # LIST command
-            0xA9, 0x4E,       # LDA #$4E ('N')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x4F,       # LDA #$4F ('O')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x20,       # LDA #$20 (Space)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x50,       # LDA #$50 ('P')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x52,       # LDA #$52 ('R')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x4F,       # LDA #$4F ('O')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x47,       # LDA #$47 ('G')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x0D,       # LDA #$0D (Return)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
-            # NEW command
-            0xA9, 0x4D,       # LDA #$4D ('M')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x45,       # LDA #$45 ('E')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x4D,       # LDA #$4D ('M')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x4F,       # LDA #$4F ('O')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x52,       # LDA #$52 ('R')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x59,       # LDA #$59 ('Y')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x20,       # LDA #$20 (Space)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x43,       # LDA #$43 ('C')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x4C,       # LDA #$4C ('L')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x45,       # LDA #$45 ('E')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x41,       # LDA #$41 ('A')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x52,       # LDA #$52 ('R')
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0xA9, 0x0D,       # LDA #$0D (Return)
-            0x20, 0xD2, 0xFF, # JSR $FFD2
-            0x4C, 0x36, 0xC0, # JMP $C036 (Back to prompt)
-        ])
-        
-        # Fill the rest of the ROM with zeros up to 16K
-        basic_rom.extend([0] * (16384 - len(basic_rom)))
+        # Generate a simple ROM with BASIC interpreter stubs, zero-filled
+        # to 16K
+        basic_rom = bytearray(16384)
+        basic_rom[:len(_BASIC_STUB)] = _BASIC_STUB
         
         # KERNAL ROM with key I/O routines
-        kernal_rom = bytearray([0] * 4096)
+        kernal_rom = bytearray(4096)
         
         # CHROUT: Output a character ($FFD2)
         kernal_idx = 0xFFD2 - 0xF000
-        kernal_rom[kernal_idx:kernal_idx+16] = [
-            0x48,             # PHA (Save A)
-            0x86, 0xFB,       # STX $FB (Save X)
-            0x84, 0xFC,       # STY $FC (Save Y)
-            0xAA,             # TAX (Character to X)
-            0xBD, 0x00, 0xE0, # LDA $E000,X (Look up in character ROM)
-            0x8D, 0x00, 0x80, # STA $8000 (Store to screen)
-            0xEE, 0x37, 0x03, # INC $0337 (Increment cursor position)
-            0xA6, 0xFB,       # LDX $FB (Restore X)
-            0xA4, 0xFC,       # LDY $FC (Restore Y)
-            0x68,             # PLA (Restore A)
-            0x60              # RTS
-        ]
+        kernal_rom[kernal_idx:kernal_idx + len(_CHROUT_STUB)] = _CHROUT_STUB
         
         # GETIN: Get a character from keyboard ($FFE4)
         kernal_idx = 0xFFE4 - 0xF000
-        kernal_rom[kernal_idx:kernal_idx+16] = [
-            0xAD, 0x10, 0xE8, # LDA $E810 (Read keyboard row)
-            0xC9, 0xFF,       # CMP #$FF (Check if any key pressed)
-            0xF0, 0x05,       # BEQ +5 (Return 0 if no key)
-            0xAD, 0x11, 0xE8, # LDA $E811 (Get key code)
-            0xEE, 0x12, 0xE8, # INC $E812 (Acknowledge key)
-            0x60,             # RTS
-            0xA9, 0x00,       # LDA #$00 (No key pressed)
-            0x60              # RTS
-        ]
+        kernal_rom[kernal_idx:kernal_idx + len(_GETIN_STUB)] = _GETIN_STUB
         
         # Character ROM (simplified, maps ASCII to PETSCII)
-        char_rom = bytearray([0] * 4096)
-        for i in range(32, 127):
-            char_rom[i] = i  # Direct mapping for printable ASCII
+        char_rom = bytearray(4096)
+        char_rom[32:127] = range(32, 127)  # Direct mapping for printable ASCII
         
         # Reset/IRQ vectors
-        basic_rom[0x3FFC - 0xC000] = 0x00  # Reset vector low byte
-        basic_rom[0x3FFD - 0xC000] = 0xC0  # Reset vector high byte
-        basic_rom[0x3FFE - 0xC000] = 0x36  # IRQ vector low byte
-        basic_rom[0x3FFF - 0xC000] = 0xC0  # IRQ vector high byte
+        basic_rom[0xFFFC - 0xC000] = 0x00  # Reset vector low byte
+        basic_rom[0xFFFD - 0xC000] = 0xC0  # Reset vector high byte
+        basic_rom[0xFFFE - 0xC000] = 0x36  # IRQ vector low byte
+        basic_rom[0xFFFF - 0xC000] = 0xC0  # IRQ vector high byte
         
         # Load ROMs into memory
         self.memory.load_rom(basic_rom, 0xC000)  # BASIC ROM at $C000-$FFFF
@@ -2290,12 +2146,14 @@ class PET:
     
     def process_key(self, key) -> None:
         """Process a key event."""
-        if isinstance(key, int) and key == 27:  # ESC
+        # Non-int keys never compare equal to the key codes, so no
+        # isinstance() check is needed
+        if key == self._key_esc:
             self.stop()
             return
         
         # Toggle debug mode with F12
-        if isinstance(key, int) and key == curses.KEY_F12:
+        if key == self._key_f12:
             self.debug_mode = not self.debug_mode
             return
         
@@ -2308,19 +2166,14 @@ class PET:
         if not self.running:
             return
         
-        # Run CPU for a certain number of cycles
+        # Run CPU for a certain number of cycles, in bursts of
+        # cycles_per_timer_update with the VIA timers advanced between them
         cycles_this_frame = 0
         while cycles_this_frame < self.cycles_per_frame and self.running:
-            # Execute one instruction
-            cycles = self.cpu.step(self.memory)
+            burst = min(self.cycles_per_timer_update, self.cycles_per_frame - cycles_this_frame)
+            cycles = self.cpu.execute(self.memory, burst)
             cycles_this_frame += cycles
-            
-            # Update VIAs
-            if self.via1.update_timers(cycles):
-                self.cpu.trigger_irq()
-            
-            if self.via2.update_timers(cycles):
-                self.cpu.trigger_irq()
+            self._update_timers(cycles)
         
         # Update screen
         self.screen.update(self.video_ram)
@@ -2329,6 +2182,14 @@ class PET:
         if self.debug_mode:
             self._update_debug_info()
     
+    def _update_timers(self, cycles: int) -> None:
+        """Advance both VIAs' timers, raising an IRQ if either fires."""
+        if self.via1.update_timers(cycles):
+            self.cpu.trigger_irq()
+        
+        if self.via2.update_timers(cycles):
+            self.cpu.trigger_irq()
+    
     def _update_debug_info(self) -> None:
         """Show debug information on screen."""
         cpu_state = self.cpu.get_state()
@@ -2353,7 +2214,10 @@ def main(stdscr):
     pet = PET(stdscr)
     pet.start()
     
-    # Main loop
+    # Main loop, paced against a deadline so time spent emulating a frame
+    # counts towards the frame period instead of adding to it
+    frame_period = 0.02  # ~50Hz
+    deadline = time.perf_counter() + frame_period
     while pet.running:
         # Process input
         try:
@@ -2367,13 +2231,14 @@ def main(stdscr):
         pet.run_frame()
         
         # Throttle to approximate PET speed
-        time.sleep(0.02)  # ~50Hz
+        now = time.perf_counter()
+        if now < deadline:
+            time.sleep(deadline - now)
+        elif now - deadline > 5 * frame_period:
+            # Too far behind to catch up: resynchronise rather than
+            # running frames back to back
+            deadline = now
+        deadline += frame_period
 
 if __name__ == "__main__":
     curses.wrapper(main)
- self.C
-        self.C = value & 1
-        value = (value >> 1) | (old_carry << 7)
-        memory.write(addr, value)
-        self.update_ZN(value)
-        self.cycles += 7
\ No newline at end of file